@@ -10,24 +10,28 @@ Single-hand gesture-controlled virtual keyboard with:
 """
 
 import cv2
+import numpy as np
 import pyautogui
 from cvzone.HandTrackingModule import HandDetector
 from screeninfo import get_monitors
 import time
 import os
 import sys
+import queue
+import threading
 
 # Import shared modules
 from src.core.keyboard_utils import (
-    draw_key, generate_keyboard_layout, draw_text_bar, 
-    draw_status_bar, draw_glow_border, clear_gradient_cache,
-    toggle_layout, get_current_layout
+    generate_keyboard_layout, draw_text_bar,
+    draw_status_bar, clear_gradient_cache,
+    toggle_layout, get_current_layout, render_keyboard, hit_test,
+    draw_cached_text
 )
 from src.core.gesture_handler import GestureDetector, HandCalibration
 from src.utils.file_utils import save_text_to_file, copy_to_clipboard
 from src.utils.performance_monitor import FPSCounter
 from src.utils.exceptions import WebcamError, FileOperationError, ClipboardError
-from src.utils.themes import get_theme, set_theme, get_available_themes
+from src.utils.themes import ACTIVE_THEME, set_theme, get_available_themes
 from src.utils.logging_config import log_info, log_warning, log_error
 from src.utils.settings import load_settings, update_setting
 from src.core.calibration import run_calibration_mode
@@ -40,11 +44,19 @@ KEY_FLASH_CLEANUP_INTERVAL = 5.0  # Clean old entries every 5 seconds
 EXIT_GESTURE_HOLD_TIME = 1.5  # Must hold exit gesture for 1.5 seconds
 HAND_CONFIDENCE_THRESHOLD = 0.7  # Minimum hand detection confidence
 
+# OpenCV pipeline tuning: keep the optimized (SIMD) dispatch on and cap
+# OpenCV's worker pool so it doesn't oversubscribe the cores MediaPipe's
+# own thread pool is already using on typical 4-8 core machines.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(2)
+
 # === Sound Setup ===
 click_sound = None
 try:
     import pygame
-    pygame.mixer.init()
+    # Small mixer buffer keeps click playback latency low (~23 ms at
+    # 22.05 kHz) without ever blocking the frame loop
+    pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
     audio_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "clickSound.mp3")
     if os.path.exists(audio_path):
         click_sound = pygame.mixer.Sound(audio_path)
@@ -54,12 +66,76 @@ try:
 except Exception as e:
     log_warning(f"Pygame audio init failed: {e}. Audio feedback disabled.")
 
+# === Keystroke Injection ===
+# pyautogui.press dispatches OS keystrokes synchronously and can take
+# 5-20 ms per press, so clicks hand the key name to a daemon worker
+# instead of stalling the frame loop. (click_sound.play already runs
+# asynchronously on the pygame mixer.)
+_key_press_queue = queue.SimpleQueue()
+
+
+def _key_press_worker():
+    while True:
+        key = _key_press_queue.get()
+        try:
+            pyautogui.press(key)
+        except Exception:
+            pass  # Never let a failed injection kill the worker
+
+
+threading.Thread(target=_key_press_worker, daemon=True).start()
+
+
+def press_key(key: str):
+    """Queue a keystroke for asynchronous OS injection."""
+    _key_press_queue.put(key)
+
 
 def cleanup_key_flash(key_flash: dict, current_time: float, max_age: float = 2.0) -> dict:
     """Remove old entries from key_flash dict to prevent memory leak."""
     return {k: v for k, v in key_flash.items() if current_time - v < max_age}
 
 
+# Resolution fed to the hand detector. MediaPipe resizes its model inputs
+# to ~224px internally, so running findHands on the full capture frame only
+# adds BGR->RGB conversion and resize bandwidth, not accuracy.
+DETECT_WIDTH, DETECT_HEIGHT = 640, 360
+
+
+def detect_hands(detector, img):
+    """
+    Run hand detection on a downscaled copy of the frame.
+
+    findHands gets a 640x360 INTER_AREA resize; landmark, bbox and center
+    coordinates are scaled back into full-frame space before returning, so
+    callers keep drawing and hit-testing on the original image.
+
+    Args:
+        detector: cvzone HandDetector
+        img: Full-resolution BGR frame (left untouched)
+
+    Returns:
+        List of hand dicts in full-frame coordinates
+    """
+    small = cv2.resize(img, (DETECT_WIDTH, DETECT_HEIGHT),
+                       interpolation=cv2.INTER_AREA)
+    hands, _ = detector.findHands(small, draw=False)
+    if not hands:
+        return hands
+
+    sx = img.shape[1] / DETECT_WIDTH
+    sy = img.shape[0] / DETECT_HEIGHT
+    for hand in hands:
+        hand['lmList'] = [[int(x * sx), int(y * sy), z]
+                          for x, y, z in hand['lmList']]
+        bx, by, bw, bh = hand['bbox']
+        hand['bbox'] = (int(bx * sx), int(by * sy), int(bw * sx), int(bh * sy))
+        if 'center' in hand:
+            cx, cy = hand['center']
+            hand['center'] = (int(cx * sx), int(cy * sy))
+    return hands
+
+
 class TextHistory:
     """Manages text history for undo/redo functionality."""
     
@@ -215,8 +291,16 @@ def main():
         raise WebcamError(f"Webcam initialization failed: {e}")
     
     # === Hand Detector ===
-    detector = HandDetector(detectionCon=HAND_CONFIDENCE_THRESHOLD)
-    
+    # Lite landmark model (modelComplexity=0) is ~2x faster than the full
+    # one with no practical accuracy loss at webcam range; this app only
+    # ever reads one hand, so cap tracking there too
+    detector = HandDetector(detectionCon=HAND_CONFIDENCE_THRESHOLD,
+                            maxHands=1, modelComplexity=0)
+
+    # Click threshold only changes on calibration, so read it once here
+    # (and again after 'k' recalibrates) instead of every frame
+    click_threshold = gesture_detector.calibration.get_click_threshold()
+
     log_info("Touchless Keyboard started successfully!")
     log_info("Controls: 's' save | 'c' copy | 't' theme | 'k' calibrate | ESC quit")
     
@@ -242,8 +326,8 @@ def main():
                 last_cleanup_time = current_time
             
             # === Hand Detection ===
-            hands, img = detector.findHands(img, draw=False)
-            theme = get_theme()
+            hands = detect_hands(detector, img)
+            theme = ACTIVE_THEME
             
             # Update FPS
             current_fps = fps_counter.update()
@@ -283,6 +367,7 @@ def main():
                 if new_calibration:
                     calibration = new_calibration
                     gesture_detector.calibration = calibration
+                    click_threshold = calibration.get_click_threshold()
                     notification_text = "Calibration saved!"
                     notification_time = time.time()
             elif key_press == ord('n'):
@@ -344,17 +429,19 @@ def main():
             if hands:
                 # Reset smoothing buffer when hand reappears
                 hand = hands[0]
-                lmList = hand['lmList']
+                # One contiguous array per frame: every later landmark
+                # access is an array view instead of nested list indexing
+                lm = np.asarray(hand['lmList'], dtype=np.int32)
                 bbox = hand['bbox']
-                
+
                 # Draw hand bounding box
                 bbox_x, bbox_y, bbox_w, bbox_h = bbox
-                cv2.rectangle(img, (bbox_x, bbox_y), (bbox_x + bbox_w, bbox_y + bbox_h), 
+                cv2.rectangle(img, (bbox_x, bbox_y), (bbox_x + bbox_w, bbox_y + bbox_h),
                              theme['hand_bbox'], 2)
-                
+
                 # Get landmark positions
-                thumb_tip = lmList[4]
-                index_tip = lmList[8]
+                thumb_tip = lm[4]
+                index_tip = lm[8]
                 
                 # Visual feedback
                 cv2.line(img, tuple(thumb_tip[:2]), tuple(index_tip[:2]), theme['glow_color'], 3)
@@ -362,13 +449,12 @@ def main():
                 mid_y = (thumb_tip[1] + index_tip[1]) // 2
                 cv2.circle(img, (mid_x, mid_y), 10, theme['glow_color'], -1)
                 
-                # Gesture detection
-                click_detected, click_distance = gesture_detector.detect_click(lmList, current_time)
-                exit_detected, _ = gesture_detector.detect_exit(lmList)
+                # Gesture detection (both pinch distances in one kernel call)
+                click_detected, click_distance, exit_detected, _ = \
+                    gesture_detector.detect_gestures(lm, current_time)
                 
                 # Distance indicator
-                threshold = gesture_detector.calibration.get_click_threshold()
-                dist_color = theme['indicator_ready'] if click_distance < threshold else theme['indicator_wait']
+                dist_color = theme['indicator_ready'] if click_distance < click_threshold else theme['indicator_wait']
                 cv2.putText(img, f"{int(click_distance)}px", (mid_x + 15, mid_y), 
                            cv2.FONT_HERSHEY_SIMPLEX, 0.5, dist_color, 2)
                 
@@ -389,78 +475,75 @@ def main():
                 
                 # Check which key is being hovered
                 tip_x, tip_y = index_tip[0], index_tip[1]
-                for key_x, key_y, key_w, key_h, label in keys:
-                    if key_x < tip_x < key_x + key_w and key_y < tip_y < key_y + key_h:
-                        hovered_key = label
-                        
-                        if click_detected:
-                            if click_sound:
-                                try:
-                                    click_sound.play()
-                                except Exception:
-                                    pass  # Ignore audio errors
-                            
-                            # Handle special keys
-                            if label == 'SHIFT':
-                                shift_active = not shift_active
-                                notification_text = "Shift: ON" if shift_active else "Shift: OFF"
-                                notification_time = current_time
-                            elif label == '__':
-                                pyautogui.press('space')
-                                text_history.push(typed_text + ' ')
-                                typed_text += ' '
-                            elif label == '<-':
-                                pyautogui.press('backspace')
-                                if typed_text:
-                                    text_history.push(typed_text[:-1])
-                                    typed_text = typed_text[:-1]
-                            elif label == 'ENTER':
-                                pyautogui.press('enter')
-                                text_history.push(typed_text + '\n')
-                                typed_text += '\n'
-                            elif label == 'TAB':
-                                pyautogui.press('tab')
-                                text_history.push(typed_text + '\t')
-                                typed_text += '\t'
-                            elif label == 'CAPS':
-                                caps_lock = not caps_lock
-                                notification_text = "CAPS: ON" if caps_lock else "CAPS: OFF"
-                                notification_time = current_time
-                            elif label == 'NUM':
-                                new_layout = toggle_layout()
-                                keys = generate_keyboard_layout(start_x=30, start_y=85, 
-                                                                key_width=int(key_size * keyboard_scale), 
-                                                                key_height=int(key_size * keyboard_scale), 
-                                                                gap=key_gap)
-                                notification_text = "Numpad Mode"
-                                notification_time = current_time
-                            elif label == 'ABC':
-                                new_layout = toggle_layout()
-                                keys = generate_keyboard_layout(start_x=30, start_y=85, 
-                                                                key_width=int(key_size * keyboard_scale), 
-                                                                key_height=int(key_size * keyboard_scale), 
-                                                                gap=key_gap)
-                                notification_text = "QWERTY Mode"
-                                notification_time = current_time
-                            elif label in ['+', '-', '*', '/']:
-                                # Numpad operators
-                                pyautogui.press(label)
-                                text_history.push(typed_text + label)
-                                typed_text += label
-                            else:
-                                # Regular character - apply caps/shift logic
-                                use_upper = caps_lock or shift_active
-                                char = label.upper() if use_upper else label.lower()
-                                pyautogui.press(char.lower())  # pyautogui uses lowercase
-                                text_history.push(typed_text + char)
-                                typed_text += char
-                                
-                                # SHIFT auto-disables, CAPS persists
-                                if shift_active and label.isalpha():
-                                    shift_active = False
-                            
-                            key_flash[label] = current_time
-                        break
+                hovered_key = hit_test(keys, tip_x, tip_y)
+                if hovered_key is not None and click_detected:
+                    label = hovered_key
+                    if click_sound:
+                        try:
+                            click_sound.play()
+                        except Exception:
+                            pass  # Ignore audio errors
+
+                    # Handle special keys
+                    if label == 'SHIFT':
+                        shift_active = not shift_active
+                        notification_text = "Shift: ON" if shift_active else "Shift: OFF"
+                        notification_time = current_time
+                    elif label == '__':
+                        press_key('space')
+                        text_history.push(typed_text + ' ')
+                        typed_text += ' '
+                    elif label == '<-':
+                        press_key('backspace')
+                        if typed_text:
+                            text_history.push(typed_text[:-1])
+                            typed_text = typed_text[:-1]
+                    elif label == 'ENTER':
+                        press_key('enter')
+                        text_history.push(typed_text + '\n')
+                        typed_text += '\n'
+                    elif label == 'TAB':
+                        press_key('tab')
+                        text_history.push(typed_text + '\t')
+                        typed_text += '\t'
+                    elif label == 'CAPS':
+                        caps_lock = not caps_lock
+                        notification_text = "CAPS: ON" if caps_lock else "CAPS: OFF"
+                        notification_time = current_time
+                    elif label == 'NUM':
+                        new_layout = toggle_layout()
+                        keys = generate_keyboard_layout(start_x=30, start_y=85, 
+                                                        key_width=int(key_size * keyboard_scale), 
+                                                        key_height=int(key_size * keyboard_scale), 
+                                                        gap=key_gap)
+                        notification_text = "Numpad Mode"
+                        notification_time = current_time
+                    elif label == 'ABC':
+                        new_layout = toggle_layout()
+                        keys = generate_keyboard_layout(start_x=30, start_y=85, 
+                                                        key_width=int(key_size * keyboard_scale), 
+                                                        key_height=int(key_size * keyboard_scale), 
+                                                        gap=key_gap)
+                        notification_text = "QWERTY Mode"
+                        notification_time = current_time
+                    elif label in ['+', '-', '*', '/']:
+                        # Numpad operators
+                        press_key(label)
+                        text_history.push(typed_text + label)
+                        typed_text += label
+                    else:
+                        # Regular character - apply caps/shift logic
+                        use_upper = caps_lock or shift_active
+                        char = label.upper() if use_upper else label.lower()
+                        press_key(char.lower())  # pyautogui uses lowercase
+                        text_history.push(typed_text + char)
+                        typed_text += char
+
+                        # SHIFT auto-disables, CAPS persists
+                        if shift_active and label.isalpha():
+                            shift_active = False
+
+                    key_flash[label] = current_time
             else:
                 # Reset smoothing when hand disappears
                 gesture_detector.reset_smoothing()
@@ -469,23 +552,17 @@ def main():
             # === Draw UI Elements ===
             draw_text_bar(img, typed_text, screen_width, y_pos=15, theme_name=current_theme)
             
-            for key_x, key_y, key_w, key_h, key in keys:
-                is_highlighted = key in key_flash and current_time - key_flash[key] < FLASH_DURATION
-                is_hovered = key == hovered_key
-                is_shift_key = key == 'SHIFT' and shift_active
-                
-                draw_key(img, (key_x, key_y), key, 
-                        highlight=is_highlighted or is_shift_key,
-                        hover=is_hovered,
-                        width=int(key_w), height=int(key_h),
-                        theme_name=current_theme)
+            flashed = {k for k, t in key_flash.items()
+                       if current_time - t < FLASH_DURATION}
+            render_keyboard(img, keys, hovered_key=hovered_key, flashed=flashed,
+                            shift_active=shift_active, theme_name=current_theme)
             
             notif = notification_text if current_time - notification_time < 2.0 else ""
             draw_status_bar(img, int(current_fps), current_theme, screen_width, screen_height, notif)
             
             
-            cv2.putText(img, "Press 'h' for help | ESC to exit", 
-                       (15, screen_height - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (180, 180, 180), 1)
+            draw_cached_text(img, "Press 'h' for help | ESC to exit",
+                             (15, screen_height - 60), 0.5, (180, 180, 180), 1)
             
             if help_visible:
                 draw_help_overlay(img, screen_width, screen_height)
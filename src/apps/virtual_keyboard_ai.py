@@ -10,27 +10,31 @@ Dual-hand gesture-controlled virtual keyboard with ML data collection:
 """
 
 import cv2
+import numpy as np
 import pyautogui
 from cvzone.HandTrackingModule import HandDetector
 from screeninfo import get_monitors
 import time
 import os
 import sys
-import csv
+import atexit
+import queue
+import threading
 from pathlib import Path
 import logging
 
 # Import shared modules
 from src.core.keyboard_utils import (
-    draw_key, generate_keyboard_layout, draw_text_bar, 
+    generate_keyboard_layout, draw_text_bar,
     draw_status_bar, clear_gradient_cache,
-    toggle_layout, get_current_layout
+    toggle_layout, get_current_layout, render_keyboard, hit_test,
+    draw_cached_text
 )
 from src.core.gesture_handler import GestureDetector, HandCalibration
 from src.utils.file_utils import save_text_to_file, copy_to_clipboard, sanitize_csv_value
 from src.utils.performance_monitor import FPSCounter
 from src.utils.exceptions import WebcamError, FileOperationError, ClipboardError
-from src.utils.themes import get_theme, set_theme, get_available_themes
+from src.utils.themes import ACTIVE_THEME, set_theme, get_available_themes
 from src.utils.logging_config import log_info, log_warning, log_error, setup_logger
 from src.utils.settings import load_settings, update_setting, get_log_file_path
 from src.core.calibration import run_calibration_mode
@@ -43,11 +47,19 @@ KEY_FLASH_CLEANUP_INTERVAL = 5.0
 EXIT_GESTURE_HOLD_TIME = 1.5
 HAND_CONFIDENCE_THRESHOLD = 0.7
 
+# OpenCV pipeline tuning: keep the optimized (SIMD) dispatch on and cap
+# OpenCV's worker pool so it doesn't oversubscribe the cores MediaPipe's
+# own thread pool is already using on typical 4-8 core machines.
+cv2.setUseOptimized(True)
+cv2.setNumThreads(2)
+
 # === Sound Setup ===
 click_sound = None
 try:
     import pygame
-    pygame.mixer.init()
+    # Small mixer buffer keeps click playback latency low (~23 ms at
+    # 22.05 kHz) without ever blocking the frame loop
+    pygame.mixer.init(frequency=22050, size=-16, channels=1, buffer=512)
     audio_path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "assets", "clickSound.mp3")
     if os.path.exists(audio_path):
         click_sound = pygame.mixer.Sound(audio_path)
@@ -58,18 +70,81 @@ except Exception as e:
     log_warning(f"Pygame audio init failed: {e}")
 
 
+# Keystroke injection: pyautogui.press dispatches OS keystrokes
+# synchronously and can take 5-20 ms per press, so clicks hand the key
+# name to a daemon worker instead of stalling the frame loop.
+# (click_sound.play already runs asynchronously on the pygame mixer.)
+_key_press_queue = queue.SimpleQueue()
+
+
+def _key_press_worker():
+    while True:
+        key = _key_press_queue.get()
+        try:
+            pyautogui.press(key)
+        except Exception:
+            pass  # Never let a failed injection kill the worker
+
+
+threading.Thread(target=_key_press_worker, daemon=True).start()
+
+
+def press_key(key: str):
+    """Queue a keystroke for asynchronous OS injection."""
+    _key_press_queue.put(key)
+
+
+# Long-lived CSV handle for gesture samples: opening/closing the file per
+# row costs several syscalls per sample, so writes go through one buffered
+# handle and are flushed every _CSV_FLUSH_EVERY rows (and at exit)
+_csv_fh = None
+_csv_rows_since_flush = 0
+_CSV_FLUSH_EVERY = 100
+
+# Rows have a fixed 21x3 landmark shape, so serialization is one
+# precompiled %-template instead of csv.writer's per-field machinery,
+# flattened through a reusable float32 buffer rather than a fresh list.
+# %g renders the integer pixel coordinates exactly as csv.writer wrote
+# them ("639", not "639.00000"), so appended rows match existing files.
+_CSV_ROW_FMT = ",".join(["%g"] * 63) + ",%s\n"
+_row_buf = np.empty(63, dtype=np.float32)
+
+
+def _get_csv_handle():
+    """Get (or open) the buffered gesture-data CSV handle."""
+    global _csv_fh
+    if _csv_fh is None:
+        data_dir = Path(__file__).parent.parent.parent / "data"
+        data_dir.mkdir(exist_ok=True)
+        _csv_fh = open(data_dir / "gesture_data.csv", "a", newline="",
+                       encoding="utf-8", buffering=65536)
+        atexit.register(_close_csv_handle)
+    return _csv_fh
+
+
+def _close_csv_handle():
+    """Flush and close the gesture-data CSV handle."""
+    global _csv_fh
+    if _csv_fh is not None:
+        _csv_fh.close()
+        _csv_fh = None
+
+
 def save_landmark_data(lmList, label: str) -> bool:
     """Save hand landmark data to CSV for ML training."""
-    if not lmList or len(lmList) != 21:
+    global _csv_rows_since_flush
+    if lmList is None or len(lmList) != 21:
         return False
-    data_dir = Path(__file__).parent.parent.parent / "data"
-    data_dir.mkdir(exist_ok=True)
     try:
-        with open(data_dir / "gesture_data.csv", "a", newline="", encoding="utf-8") as f:
-            cvs_writer = csv.writer(f)
-            row = [coord for point in lmList for coord in point[:3]]
-            row.append(sanitize_csv_value(label))
-            cvs_writer.writerow(row)
+        fh = _get_csv_handle()
+        arr = np.asarray(lmList, dtype=np.float32)
+        np.copyto(_row_buf, arr[:, :3].ravel())
+        fh.write(_CSV_ROW_FMT %
+                 (tuple(_row_buf.tolist()) + (sanitize_csv_value(label),)))
+        _csv_rows_since_flush += 1
+        if _csv_rows_since_flush >= _CSV_FLUSH_EVERY:
+            fh.flush()
+            _csv_rows_since_flush = 0
         log_info(f"Gesture data saved: {label}")
         return True
     except Exception as e:
@@ -77,6 +152,73 @@ def save_landmark_data(lmList, label: str) -> bool:
         return False
 
 
+def get_latest_frame(cap, skip: int = 1):
+    """
+    Fetch the most recent webcam frame, decoding only the frame kept.
+
+    cap.read() grabs and decodes every frame; grab() just advances the
+    driver queue, so stale frames buffered while the pipeline was busy are
+    discarded without paying MJPEG/YUV->BGR conversion for them.
+
+    Args:
+        cap: Open cv2.VideoCapture
+        skip: Number of grabs before retrieving (1 = newest frame only)
+
+    Returns:
+        (success, frame) like cap.read()
+    """
+    for _ in range(max(1, skip)):
+        if not cap.grab():
+            return False, None
+    return cap.retrieve()
+
+
+# Resolution fed to the hand detector. MediaPipe resizes its model inputs
+# to ~224px internally, so running findHands on the full capture frame only
+# adds BGR->RGB conversion and resize bandwidth, not accuracy.
+DETECT_WIDTH, DETECT_HEIGHT = 640, 360
+
+# Detection cadence: findHands runs every Nth pipeline frame and the
+# previous landmarks are reused in between, with the hover fingertip
+# linearly extrapolated from the last two detections. Click and exit
+# gestures only evaluate on frames where detection actually ran.
+INFERENCE_INTERVAL = 2
+
+
+def detect_hands(detector, img):
+    """
+    Run hand detection on a downscaled copy of the frame.
+
+    findHands gets a 640x360 INTER_AREA resize; landmark, bbox and center
+    coordinates are scaled back into full-frame space before returning, so
+    callers keep drawing and hit-testing on the original image.
+
+    Args:
+        detector: cvzone HandDetector
+        img: Full-resolution BGR frame (left untouched)
+
+    Returns:
+        List of hand dicts in full-frame coordinates
+    """
+    small = cv2.resize(img, (DETECT_WIDTH, DETECT_HEIGHT),
+                       interpolation=cv2.INTER_AREA)
+    hands, _ = detector.findHands(small, draw=False)
+    if not hands:
+        return hands
+
+    sx = img.shape[1] / DETECT_WIDTH
+    sy = img.shape[0] / DETECT_HEIGHT
+    for hand in hands:
+        hand['lmList'] = [[int(x * sx), int(y * sy), z]
+                          for x, y, z in hand['lmList']]
+        bx, by, bw, bh = hand['bbox']
+        hand['bbox'] = (int(bx * sx), int(by * sy), int(bw * sx), int(bh * sy))
+        if 'center' in hand:
+            cx, cy = hand['center']
+            hand['center'] = (int(cx * sx), int(cy * sy))
+    return hands
+
+
 def cleanup_key_flash(key_flash: dict, current_time: float, max_age: float = 2.0) -> dict:
     """Remove old entries from key_flash dict."""
     return {k: v for k, v in key_flash.items() if current_time - v < max_age}
@@ -196,15 +338,88 @@ def main():
         cap = cv2.VideoCapture(WEBCAM_INDEX)
         cap.set(cv2.CAP_PROP_FRAME_WIDTH, int(screen_width * 0.85))
         cap.set(cv2.CAP_PROP_FRAME_HEIGHT, int(screen_height * 0.75))
+        # Compressed capture + single-frame driver buffer keep retrieve()
+        # cheap and ensure grab-skipping always lands on a fresh frame
+        cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
         if not cap.isOpened(): raise WebcamError(f"Cannot access webcam {WEBCAM_INDEX}")
     except Exception as e:
         log_error(f"Webcam init failed: {e}")
         if cap: cap.release()
         raise
     
-    detector = HandDetector(detectionCon=HAND_CONFIDENCE_THRESHOLD)
+    # Lite landmark model (modelComplexity=0) is ~2x faster than the full
+    # one with no practical accuracy loss at webcam range
+    detector = HandDetector(detectionCon=HAND_CONFIDENCE_THRESHOLD,
+                            modelComplexity=0)
+
+    # Click threshold only changes on calibration, so read it once here
+    # (and again after 'k' recalibrates) instead of every frame
+    click_threshold = gesture_detector.calibration.get_click_threshold()
+
     log_info("AI Keyboard started! Press 'h' for help.")
-    
+
+    # Three-stage pipeline: a capture thread decodes frames, this thread
+    # runs detection + gesture logic + drawing, and a display thread owns
+    # imshow/waitKey. Queues are bounded at 2 and drop the oldest frame
+    # under pressure, so a slow stage adds no latency backlog. Key codes
+    # flow back from the display thread through key_events.
+    frame_queue = queue.Queue(maxsize=2)
+    display_queue = queue.Queue(maxsize=2)
+    key_events = queue.SimpleQueue()
+    stop_event = threading.Event()
+    pipeline_paused = threading.Event()
+
+    def _queue_replace(q, item):
+        """Put into a bounded queue, dropping the oldest entry if full."""
+        while True:
+            try:
+                q.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    q.get_nowait()
+                except queue.Empty:
+                    pass
+
+    def _capture_loop():
+        while not stop_event.is_set():
+            if pipeline_paused.is_set():
+                time.sleep(0.05)
+                continue
+            success, frame = get_latest_frame(cap)
+            if not success:
+                time.sleep(0.005)
+                continue
+            _queue_replace(frame_queue, frame)
+
+    def _display_loop():
+        while not stop_event.is_set():
+            if pipeline_paused.is_set():
+                time.sleep(0.05)
+                continue
+            try:
+                frame = display_queue.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            cv2.imshow("AI Touchless Keyboard", frame)
+            key = cv2.waitKey(1)
+            if key != -1:
+                key_events.put(key)
+
+    capture_thread = threading.Thread(target=_capture_loop, daemon=True)
+    display_thread = threading.Thread(target=_display_loop, daemon=True)
+    capture_thread.start()
+    display_thread.start()
+
+    # Detect-then-track state (see INFERENCE_INTERVAL)
+    frame_idx = 0
+    prev_hands = None
+    prev_right_tip = None
+    cur_right_tip = None
+    last_click_distance = 0.0
+    last_exit_detected = False
+
     try:
         while True:
             current_time = time.time()
@@ -213,21 +428,32 @@ def main():
                 time.sleep((1.0 / TARGET_FPS) - elapsed)
                 current_time = time.time()
             last_frame_time = current_time
-            
-            success, img = cap.read()
-            if not success: continue
+
+            try:
+                img = frame_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
             
             if current_time - last_cleanup_time > KEY_FLASH_CLEANUP_INTERVAL:
                 key_flash = cleanup_key_flash(key_flash, current_time)
                 last_cleanup_time = current_time
             
-            hands, img = detector.findHands(img, draw=False)
+            detection_due = prev_hands is None or frame_idx % INFERENCE_INTERVAL == 0
+            frame_idx += 1
+            if detection_due:
+                hands = detect_hands(detector, img)
+                prev_hands = hands
+            else:
+                hands = prev_hands
             current_fps = fps_counter.update()
             
             click_detected = False
             hovered_key = None
-            
-            key_press = cv2.waitKey(1)
+
+            try:
+                key_press = key_events.get_nowait()
+            except queue.Empty:
+                key_press = -1
             if key_press == ord('s'):
                 try:
                     if save_text_to_file(typed_text):
@@ -253,10 +479,16 @@ def main():
                 notification_text = f"Theme: {current_theme.title()}"
                 notification_time = current_time
             elif key_press == ord('k'):
+                # Calibration drives the camera and window itself, so park
+                # the capture/display threads for its duration
+                pipeline_paused.set()
+                time.sleep(0.1)
                 new_calibration = run_calibration_mode(cap, screen_width, screen_height)
+                pipeline_paused.clear()
                 if new_calibration:
                     calibration = new_calibration
                     gesture_detector.calibration = calibration
+                    click_threshold = calibration.get_click_threshold()
                     notification_text = "Calibration saved!"
                     notification_time = time.time()
             elif key_press == ord('n'):
@@ -318,27 +550,36 @@ def main():
                 elif hand['type'] == 'Right': right_hand = hand
             
             if left_hand:
-                lmList = left_hand['lmList']
+                # One contiguous array per hand per frame: later landmark
+                # access is an array view instead of nested list indexing
+                lm = np.asarray(left_hand['lmList'], dtype=np.int32)
                 bbox = left_hand['bbox']
-                cv2.rectangle(img, (bbox[0], bbox[1]), (bbox[0] + bbox[2], bbox[1] + bbox[3]), get_theme()['glow_color'], 2)
-                
-                thumb_tip = lmList[4]
-                index_tip = lmList[8]
-                cv2.line(img, tuple(thumb_tip[:2]), tuple(index_tip[:2]), get_theme()['glow_color'], 3)
+                cv2.rectangle(img, (bbox[0], bbox[1]), (bbox[0] + bbox[2], bbox[1] + bbox[3]), ACTIVE_THEME['glow_color'], 2)
+
+                thumb_tip = lm[4]
+                index_tip = lm[8]
+                cv2.line(img, tuple(thumb_tip[:2]), tuple(index_tip[:2]), ACTIVE_THEME['glow_color'], 3)
                 mid_x = (thumb_tip[0] + index_tip[0]) // 2
                 mid_y = (thumb_tip[1] + index_tip[1]) // 2
-                cv2.circle(img, (mid_x, mid_y), 10, get_theme()['glow_color'], -1)
-                
-                click_detected, click_distance = gesture_detector.detect_click(lmList, current_time)
-                exit_detected, _ = gesture_detector.detect_exit(lmList)
+                cv2.circle(img, (mid_x, mid_y), 10, ACTIVE_THEME['glow_color'], -1)
                 
-                threshold = gesture_detector.calibration.get_click_threshold()
-                dist_color = get_theme()['indicator_ready'] if click_distance < threshold else get_theme()['indicator_wait']
+                if detection_due:
+                    click_detected, click_distance, exit_detected, _ = \
+                        gesture_detector.detect_gestures(lm, current_time)
+                    last_click_distance = click_distance
+                    last_exit_detected = exit_detected
+                else:
+                    # Stale landmarks: keep the held exit state and the last
+                    # distance readout, but never fire a click off them
+                    click_distance = last_click_distance
+                    exit_detected = last_exit_detected
+
+                dist_color = ACTIVE_THEME['indicator_ready'] if click_distance < click_threshold else ACTIVE_THEME['indicator_wait']
                 cv2.putText(img, f"L: {int(click_distance)}px", (mid_x + 15, mid_y), cv2.FONT_HERSHEY_SIMPLEX, 0.5, dist_color, 2)
                 
                 if key_press == ord('l'):
                     label = 'click' if click_detected else ('exit' if exit_detected else 'idle')
-                    save_landmark_data(lmList, label)
+                    save_landmark_data(lm, label)
                 
                 if exit_detected:
                     if exit_gesture_start is None: exit_gesture_start = current_time
@@ -351,90 +592,99 @@ def main():
             else:
                 gesture_detector.reset_smoothing()
                 exit_gesture_start = None
-            
+                last_exit_detected = False
+
             if right_hand:
-                lmList = right_hand['lmList']
-                index_tip = lmList[8]
+                index_tip = right_hand['lmList'][8]
                 tip_x, tip_y = index_tip[0], index_tip[1]
+                if detection_due:
+                    prev_right_tip, cur_right_tip = cur_right_tip, (tip_x, tip_y)
+                elif prev_right_tip is not None:
+                    # One-frame linear extrapolation from the last two
+                    # detections keeps the hover cursor moving smoothly
+                    tip_x += tip_x - prev_right_tip[0]
+                    tip_y += tip_y - prev_right_tip[1]
                 cv2.circle(img, (tip_x, tip_y), 15, (0, 255, 255), -1)
                 
-                for key_x, key_y, key_w, key_h, label in keys:
-                    if key_x < tip_x < key_x + key_w and key_y < tip_y < key_y + key_h:
-                        hovered_key = label
-                        if click_detected:
-                            if click_sound:
-                                try: click_sound.play()
-                                except: pass
-                            
-                            if label == 'SHIFT':
-                                shift_active = not shift_active
-                                notification_text = f"Shift: {'ON' if shift_active else 'OFF'}"
-                                notification_time = current_time
-                            elif label == 'CAPS':
-                                caps_lock = not caps_lock
-                                notification_text = f"CAPS: {'ON' if caps_lock else 'OFF'}"
-                                notification_time = current_time
-                            elif label == '__':
-                                pyautogui.press('space')
-                                text_history.push(typed_text + ' ')
-                                typed_text += ' '
-                            elif label == '<-':
-                                pyautogui.press('backspace')
-                                if typed_text:
-                                    text_history.push(typed_text[:-1])
-                                    typed_text = typed_text[:-1]
-                            elif label == 'ENTER':
-                                pyautogui.press('enter')
-                                text_history.push(typed_text + '\n')
-                                typed_text += '\n'
-                            elif label == 'TAB':
-                                pyautogui.press('tab')
-                                text_history.push(typed_text + '\t')
-                                typed_text += '\t'
-                            elif label == 'NUM' or label == 'ABC':
-                                new_layout = toggle_layout()
-                                keys = generate_keyboard_layout(start_x=30, start_y=85, 
-                                                                key_width=int(key_size * keyboard_scale), 
-                                                                key_height=int(key_size * keyboard_scale), 
-                                                                gap=key_gap)
-                                notification_text = f"Mode: {new_layout.upper()}"
-                                notification_time = current_time
-                            elif label in ['+', '-', '*', '/']:
-                                pyautogui.press(label)
-                                text_history.push(typed_text + label)
-                                typed_text += label
-                            else:
-                                use_upper = caps_lock or shift_active
-                                char = label.upper() if use_upper else label.lower()
-                                pyautogui.press(char.lower())
-                                text_history.push(typed_text + char)
-                                typed_text += char
-                                if shift_active and label.isalpha(): shift_active = False
-                            
-                            key_flash[label] = current_time
-                        break
-            
+                hovered_key = hit_test(keys, tip_x, tip_y)
+                if hovered_key is not None and click_detected:
+                    label = hovered_key
+                    if click_sound:
+                        try: click_sound.play()
+                        except: pass
+
+                    if label == 'SHIFT':
+                        shift_active = not shift_active
+                        notification_text = f"Shift: {'ON' if shift_active else 'OFF'}"
+                        notification_time = current_time
+                    elif label == 'CAPS':
+                        caps_lock = not caps_lock
+                        notification_text = f"CAPS: {'ON' if caps_lock else 'OFF'}"
+                        notification_time = current_time
+                    elif label == '__':
+                        press_key('space')
+                        text_history.push(typed_text + ' ')
+                        typed_text += ' '
+                    elif label == '<-':
+                        press_key('backspace')
+                        if typed_text:
+                            text_history.push(typed_text[:-1])
+                            typed_text = typed_text[:-1]
+                    elif label == 'ENTER':
+                        press_key('enter')
+                        text_history.push(typed_text + '\n')
+                        typed_text += '\n'
+                    elif label == 'TAB':
+                        press_key('tab')
+                        text_history.push(typed_text + '\t')
+                        typed_text += '\t'
+                    elif label == 'NUM' or label == 'ABC':
+                        new_layout = toggle_layout()
+                        keys = generate_keyboard_layout(start_x=30, start_y=85, 
+                                                        key_width=int(key_size * keyboard_scale), 
+                                                        key_height=int(key_size * keyboard_scale), 
+                                                        gap=key_gap)
+                        notification_text = f"Mode: {new_layout.upper()}"
+                        notification_time = current_time
+                    elif label in ['+', '-', '*', '/']:
+                        press_key(label)
+                        text_history.push(typed_text + label)
+                        typed_text += label
+                    else:
+                        use_upper = caps_lock or shift_active
+                        char = label.upper() if use_upper else label.lower()
+                        press_key(char.lower())
+                        text_history.push(typed_text + char)
+                        typed_text += char
+                        if shift_active and label.isalpha(): shift_active = False
+
+                    key_flash[label] = current_time
+            elif detection_due:
+                prev_right_tip = cur_right_tip = None
+
             draw_text_bar(img, typed_text, screen_width, y_pos=15, theme_name=current_theme)
-            for k in keys:
-                draw_key(img, (k[0], k[1]), k[4], 
-                        highlight=(k[4] in key_flash and current_time - key_flash[k[4]] < FLASH_DURATION) or (k[4] == 'SHIFT' and shift_active),
-                        hover=(k[4] == hovered_key),
-                        width=int(k[2]), height=int(k[3]), theme_name=current_theme)
+            flashed = {k for k, t in key_flash.items()
+                       if current_time - t < FLASH_DURATION}
+            render_keyboard(img, keys, hovered_key=hovered_key, flashed=flashed,
+                            shift_active=shift_active, theme_name=current_theme)
             
             notif = notification_text if current_time - notification_time < 2.0 else ""
             draw_status_bar(img, int(current_fps), current_theme, screen_width, screen_height, notif)
-            cv2.putText(img, "Press 'h' for help | ESC to exit", (15, screen_height - 60), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (180, 180, 180), 1)
+            draw_cached_text(img, "Press 'h' for help | ESC to exit", (15, screen_height - 60), 0.5, (180, 180, 180), 1)
             
             if help_visible:
                 draw_help_overlay(img, screen_width, screen_height)
-                
-            cv2.imshow("AI Touchless Keyboard", img)
-            
+
+            _queue_replace(display_queue, img)
+
     except KeyboardInterrupt: log_info("Interrupted")
     except Exception as e:
         log_error(f"Error: {e}")
         raise
     finally:
+        stop_event.set()
+        capture_thread.join(timeout=1.0)
+        display_thread.join(timeout=1.0)
         if cap: cap.release()
         cv2.destroyAllWindows()
 
@@ -0,0 +1,111 @@
+"""
+Optional Numba-accelerated kernels for gesture math.
+
+Numba's first compile of a kernel can stall the UI for seconds, so kernels
+are decorated with @njit(cache=True) to persist compiled code on disk and
+warmed up once at import time. When numba is not installed the kernels run
+as plain Python with the same signatures.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        """No-op decorator fallback when numba is unavailable."""
+        if args and callable(args[0]):
+            return args[0]
+
+        def wrap(func):
+            return func
+        return wrap
+
+
+@njit(cache=True)
+def click_exit_distances(landmarks: np.ndarray, thumb_idx: int,
+                         index_idx: int, middle_idx: int):
+    """
+    Compute thumb-index (click) and thumb-middle (exit) distances.
+
+    Args:
+        landmarks: (21, 2+) float array of hand landmark coordinates
+        thumb_idx: Thumb tip row index
+        index_idx: Index tip row index
+        middle_idx: Middle tip row index
+
+    Returns:
+        Tuple of (click_distance, exit_distance)
+    """
+    dx = landmarks[thumb_idx, 0] - landmarks[index_idx, 0]
+    dy = landmarks[thumb_idx, 1] - landmarks[index_idx, 1]
+    click_dist = (dx * dx + dy * dy) ** 0.5
+
+    dx = landmarks[thumb_idx, 0] - landmarks[middle_idx, 0]
+    dy = landmarks[thumb_idx, 1] - landmarks[middle_idx, 1]
+    exit_dist = (dx * dx + dy * dy) ** 0.5
+
+    return click_dist, exit_dist
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def blend_rounded_rect(roi: np.ndarray, grad: np.ndarray, mask: np.ndarray,
+                       alpha_q8: int):
+    """
+    Blend a gradient into an ROI through a uint8 mask, in place.
+
+    Fixed-point alpha compositing: weights are mask * alpha_q8 in Q16, so
+    the whole loop is branchless integer math that LLVM can autovectorize.
+
+    Args:
+        roi: (h, w, 3) uint8 destination, modified in place
+        grad: (h, w, 3) uint8 gradient foreground
+        mask: (h, w) uint8 rounded-rect mask (0/255)
+        alpha_q8: Blend opacity scaled to 0..257 (alpha * 257)
+    """
+    h, w = mask.shape
+    for y in prange(h):
+        for x in range(w):
+            wq = np.uint32(mask[y, x]) * np.uint32(alpha_q8)
+            inv = np.uint32(65535) - wq
+            for c in range(3):
+                roi[y, x, c] = np.uint8(
+                    (np.uint32(grad[y, x, c]) * wq +
+                     np.uint32(roi[y, x, c]) * inv) >> 16)
+
+
+@njit(parallel=True, cache=True)
+def hand_spans(landmark_batch: np.ndarray) -> np.ndarray:
+    """
+    Compute thumb-MCP to pinky-MCP spans for a batch of hand samples.
+
+    Args:
+        landmark_batch: (N, 21, 2) float array of landmark coordinates
+
+    Returns:
+        (N,) float32 array of hand spans in pixels
+    """
+    n = landmark_batch.shape[0]
+    out = np.empty(n, dtype=np.float32)
+    for i in prange(n):
+        dx = landmark_batch[i, 2, 0] - landmark_batch[i, 17, 0]
+        dy = landmark_batch[i, 2, 1] - landmark_batch[i, 17, 1]
+        out[i] = (dx * dx + dy * dy) ** 0.5
+    return out
+
+
+# Warm up the JIT at import so the first live frame doesn't pay compile cost.
+# With cache=True this is a disk load on subsequent runs, not a recompile.
+_warmup = np.zeros((21, 3), dtype=np.float32)
+click_exit_distances(_warmup, 4, 8, 12)
+hand_spans(_warmup[np.newaxis, :, :2])
+del _warmup
+
+if NUMBA_AVAILABLE:
+    _roi = np.zeros((2, 2, 3), dtype=np.uint8)
+    blend_rounded_rect(_roi, _roi.copy(), np.zeros((2, 2), dtype=np.uint8), 217)
+    del _roi
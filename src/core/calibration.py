@@ -14,7 +14,7 @@ from cvzone.HandTrackingModule import HandDetector
 
 from src.core.gesture_handler import HandCalibration
 from src.utils.logging_config import log_info, log_warning
-from src.utils.themes import get_theme
+from src.utils.themes import get_theme, theme_version
 
 # Configuration
 CALIBRATION_TIMEOUT = 60.0  # Max seconds for calibration
@@ -22,26 +22,56 @@ SAMPLES_NEEDED = 30
 MIN_HAND_SIZE = 50  # Minimum valid hand span in pixels
 MAX_HAND_SIZE = 500  # Maximum valid hand span in pixels
 
+# Squared bounds so validation can compare squared distances without a sqrt
+_MIN_HAND_SIZE_SQ = MIN_HAND_SIZE ** 2
+_MAX_HAND_SIZE_SQ = MAX_HAND_SIZE ** 2
+
+# MediaPipe hand skeleton edges, drawn as one batched polylines call
+HAND_CONNECTIONS = np.array([
+    [0, 1], [1, 2], [2, 3], [3, 4],          # Thumb
+    [0, 5], [5, 6], [6, 7], [7, 8],          # Index
+    [5, 9], [9, 10], [10, 11], [11, 12],     # Middle
+    [9, 13], [13, 14], [14, 15], [15, 16],   # Ring
+    [13, 17], [17, 18], [18, 19], [19, 20],  # Pinky
+    [0, 17],                                 # Palm base
+], dtype=np.int32)
+
+
+def draw_hand_skeleton(img, hand_landmarks: List[List[float]],
+                       color=(0, 255, 0)):
+    """
+    Draw the 21-landmark hand skeleton in a single polylines call.
+
+    Args:
+        img: Image to draw on
+        hand_landmarks: 21 hand landmarks
+        color: Skeleton color (BGR)
+    """
+    points = np.asarray(hand_landmarks, dtype=np.int32)[:, :2]
+    cv2.polylines(img, points[HAND_CONNECTIONS], False, color, 2)
+
 
 def validate_sample(hand_landmarks: List[List[float]]) -> bool:
     """
     Validate that a hand sample is reasonable.
-    
+
     Args:
         hand_landmarks: 21 hand landmarks
-        
+
     Returns:
         True if sample is valid
     """
     if len(hand_landmarks) != 21:
         return False
-    
-    # Check hand span is reasonable
+
+    # Check hand span is reasonable (squared distance avoids the sqrt)
     thumb_base = hand_landmarks[2]
     pinky_base = hand_landmarks[17]
-    span = ((thumb_base[0] - pinky_base[0])**2 + (thumb_base[1] - pinky_base[1])**2)**0.5
-    
-    return MIN_HAND_SIZE <= span <= MAX_HAND_SIZE
+    dx = thumb_base[0] - pinky_base[0]
+    dy = thumb_base[1] - pinky_base[1]
+    span_sq = dx * dx + dy * dy
+
+    return _MIN_HAND_SIZE_SQ <= span_sq <= _MAX_HAND_SIZE_SQ
 
 
 class CalibrationUI:
@@ -62,10 +92,22 @@ class CalibrationUI:
         self.current_samples = 0
         self.start_time = None
         self.valid_samples = []
-        
+
+        # Cached theme, refreshed only when the theme version moves
+        self._theme_cache = None
+        self._theme_version = -1
+
+    def _theme(self):
+        """Get the active theme, re-fetching only after a theme change."""
+        version = theme_version()
+        if version != self._theme_version:
+            self._theme_cache = get_theme()
+            self._theme_version = version
+        return self._theme_cache
+
     def draw_progress_bar(self, img, progress: float, y: int):
         """Draw calibration progress bar."""
-        theme = get_theme()
+        theme = self._theme()
         bar_width = int(self.screen_width * 0.6)
         bar_height = 30
         x = (self.screen_width - bar_width) // 2
@@ -85,7 +127,7 @@ class CalibrationUI:
     
     def draw_hand_guide(self, img, hand_detected: bool):
         """Draw hand positioning guide."""
-        theme = get_theme()
+        theme = self._theme()
         center_x = self.screen_width // 2
         center_y = self.screen_height // 2
         
@@ -144,8 +186,11 @@ class CalibrationUI:
                     log_warning("Failed to read frame during calibration")
                     continue
                 
-                hands, img = self.detector.findHands(img, draw=True)
-                theme = get_theme()
+                hands, img = self.detector.findHands(img, draw=False)
+                theme = self._theme()
+
+                if hands:
+                    draw_hand_skeleton(img, hands[0]['lmList'], theme['glow_color'])
                 
                 # Title and timeout
                 cv2.putText(img, "CALIBRATION MODE", (self.screen_width // 2 - 180, 50),
@@ -11,8 +11,19 @@ import shutil
 from pathlib import Path
 from collections import deque
 from typing import List, Tuple, Optional, Dict
+
+import numpy as np
+
+from src.core._kernels import click_exit_distances, hand_spans
 from src.utils.exceptions import CalibrationError
 
+# orjson is a C-extension JSON codec, much faster than the stdlib module;
+# fall back to stdlib json when it is not installed
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
 class GestureSmoothing:
     """
@@ -93,16 +104,15 @@ class HandCalibration:
     def add_calibration_sample(self, hand_landmarks: List[List[float]]):
         """
         Add a hand sample for calibration.
-        
+
         Args:
             hand_landmarks: List of 21 hand landmarks
         """
-        # Measure hand size (thumb to pinky distance)
-        thumb_base = hand_landmarks[2]   # Thumb MCP joint
-        pinky_base = hand_landmarks[17]  # Pinky MCP joint
-        hand_span = self.calculate_distance(thumb_base, pinky_base)
-        
-        self.calibration_samples.append(hand_span)
+        # Keep the raw landmark coordinates; spans are computed in one
+        # batched kernel call at calibrate() time
+        self.calibration_samples.append(
+            np.asarray(hand_landmarks, dtype=np.float32)[:, :2]
+        )
     
     def calibrate(self, num_samples: int = 30) -> bool:
         """
@@ -122,8 +132,10 @@ class HandCalibration:
                 f"Insufficient samples: {len(self.calibration_samples)}/{num_samples}"
             )
         
-        # Calculate average hand size
-        self.hand_size = sum(self.calibration_samples) / len(self.calibration_samples)
+        # Compute all spans in one batched kernel call; the median rejects
+        # outlier frames (hand partially out of view, tracking glitches)
+        spans = hand_spans(np.stack(self.calibration_samples))
+        self.hand_size = float(np.median(spans))
         
         # Validate hand size is reasonable
         if self.hand_size < 50 or self.hand_size > 500:
@@ -188,8 +200,11 @@ class HandCalibration:
         }
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2)
+            if orjson is not None:
+                filepath.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+            else:
+                with open(filepath, 'w', encoding='utf-8') as f:
+                    json.dump(data, f, indent=2)
         except Exception:
             pass  # Silent fail - calibration works without persistence
     
@@ -209,9 +224,12 @@ class HandCalibration:
             return False
         
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
+            if orjson is not None:
+                data = orjson.loads(filepath.read_bytes())
+            else:
+                with open(filepath, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+
             # Validate loaded data
             if not all(k in data for k in ['hand_size', 'click_threshold', 'exit_threshold']):
                 return False
@@ -222,7 +240,8 @@ class HandCalibration:
             self.calibrated = True
             
             return True
-        except (json.JSONDecodeError, KeyError, TypeError):
+        except (ValueError, KeyError, TypeError):
+            # ValueError covers both json and orjson decode errors
             return False
         except Exception:
             return False
@@ -300,6 +319,44 @@ class GestureDetector:
         
         return False, distance
     
+    def detect_gestures(self, hand_landmarks: List[List[float]],
+                        current_time: float) -> Tuple[bool, float, bool, float]:
+        """
+        Detect click and exit gestures in one pass.
+
+        Converts the landmark list to a float32 array once and computes
+        both pinch distances in a single kernel call (JIT-compiled when
+        numba is installed), instead of walking the Python list twice
+        through detect_click/detect_exit. Smoothing, thresholds and click
+        debouncing behave exactly as in the individual detectors.
+
+        Args:
+            hand_landmarks: List of 21 hand landmarks
+            current_time: Current timestamp
+
+        Returns:
+            Tuple of (click_detected, click_distance,
+                      exit_detected, exit_distance)
+        """
+        lm = np.asarray(hand_landmarks, dtype=np.float32)
+        click_dist, exit_dist = click_exit_distances(lm, 4, 8, 12)
+        click_dist = float(click_dist)
+        exit_dist = float(exit_dist)
+
+        if self.use_smoothing and self.click_smoother:
+            click_dist = self.click_smoother.smooth(click_dist)
+        if self.use_smoothing and self.exit_smoother:
+            exit_dist = self.exit_smoother.smooth(exit_dist)
+
+        click_detected = False
+        if (click_dist < self.calibration.get_click_threshold()
+                and current_time - self.last_click_time > self.click_delay):
+            self.last_click_time = current_time
+            click_detected = True
+
+        exit_detected = exit_dist < self.calibration.get_exit_threshold()
+        return click_detected, click_dist, exit_detected, exit_dist
+
     def detect_exit(self, hand_landmarks: List[List[float]]) -> Tuple[bool, float]:
         """
         Detect exit gesture (thumb-middle pinch).
@@ -8,8 +8,19 @@ Includes gradient caching for improved performance.
 
 import cv2
 import numpy as np
+import weakref
+from collections import OrderedDict
 from typing import List, Tuple, Optional, Dict
-from src.utils.themes import get_theme, create_gradient
+from src.core._kernels import NUMBA_AVAILABLE, blend_rounded_rect
+from src.utils.config import USE_GPU
+from src.utils.themes import ACTIVE_THEME, get_theme, create_gradient
+
+# Route the static-layer composite through OpenCV's T-API (cv2.UMat) when an
+# OpenCL device exists, so the full-keyboard blend is dispatched to the GPU.
+# Without a device the UMat round-trip would only add host copies, so the
+# flag stays off and the uint8 CPU path runs unchanged.
+OPENCL_ACTIVE = USE_GPU and cv2.ocl.haveOpenCL()
+cv2.ocl.setUseOpenCL(OPENCL_ACTIVE)
 
 # Keyboard layout configurations
 KEYBOARD_SYMBOLS = [
@@ -29,6 +40,13 @@ NUMPAD_SYMBOLS = [
     ['ENTER', 'ABC']
 ]
 
+# Width multipliers for special keys (O(1) lookup instead of list scans per key)
+SPECIAL_WIDTHS = {
+    '__': 2.5,
+    'ENTER': 1.5, 'SHIFT': 1.5, 'CAPS': 1.5, '<-': 1.5,
+    'TAB': 1.2, 'NUM': 1.2, 'ABC': 1.2,
+}
+
 # Current layout mode
 _current_layout = 'qwerty'  # 'qwerty' or 'numpad'
 
@@ -52,50 +70,200 @@ def toggle_layout():
     return _current_layout
 
 # === Gradient Cache ===
-# Cache gradients by (height, width, color_top, color_bottom) to avoid recreating them every frame
-_gradient_cache: Dict[tuple, np.ndarray] = {}
-_mask_cache: Dict[tuple, np.ndarray] = {}
+# Caches are LRU: on overflow the least-recently-used entry is evicted,
+# instead of clearing everything and stalling the next frame on a rebuild
+_gradient_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
+_mask_cache: 'OrderedDict[tuple, np.ndarray]' = OrderedDict()
 MAX_CACHE_SIZE = 100
 
+# Key-sized gradients live as views into one contiguous arena instead of
+# individual allocations, so cache churn never fragments the heap and keys
+# drawn in sequence read from adjacent memory. Slots are recycled through a
+# free list as their cache entries are evicted; gradients larger than a slot
+# (e.g. the text bar strip) fall back to a plain allocation.
+_ARENA_SLOT_H, _ARENA_SLOT_W = 128, 256
+_gradient_arena = np.empty((MAX_CACHE_SIZE, _ARENA_SLOT_H, _ARENA_SLOT_W, 3),
+                           dtype=np.uint8)
+_gradient_free_slots = list(range(MAX_CACHE_SIZE))
+_gradient_slots: Dict[tuple, int] = {}
+
 
 def _get_cached_gradient(h: int, w: int, color_top: tuple, color_bottom: tuple) -> np.ndarray:
-    """Get gradient from cache or create and cache it."""
+    """Get gradient from cache or create and cache it (LRU eviction)."""
     key = (h, w, color_top, color_bottom)
-    
-    if key not in _gradient_cache:
-        # Clear cache if too large
-        if len(_gradient_cache) > MAX_CACHE_SIZE:
-            _gradient_cache.clear()
-        _gradient_cache[key] = create_gradient(h, w, color_top, color_bottom)
-    
-    return _gradient_cache[key]
+    gradient = _gradient_cache.get(key)
+
+    if gradient is None:
+        if len(_gradient_cache) >= MAX_CACHE_SIZE:
+            old_key, _ = _gradient_cache.popitem(last=False)
+            slot = _gradient_slots.pop(old_key, None)
+            if slot is not None:
+                _gradient_free_slots.append(slot)
+
+        out = None
+        if h <= _ARENA_SLOT_H and w <= _ARENA_SLOT_W and _gradient_free_slots:
+            slot = _gradient_free_slots.pop()
+            _gradient_slots[key] = slot
+            out = _gradient_arena[slot, :h, :w]
+        gradient = create_gradient(h, w, color_top, color_bottom, out=out)
+        _gradient_cache[key] = gradient
+    else:
+        _gradient_cache.move_to_end(key)
+
+    return gradient
+
+
+# Quarter-disk corner tiles shared by every mask of the same radius
+_corner_tile_cache: Dict[int, np.ndarray] = {}
+
+
+def _get_corner_tile(radius: int) -> np.ndarray:
+    """Get the quarter-disk tile for a corner radius (built once per radius)."""
+    tile = _corner_tile_cache.get(radius)
+    if tile is None:
+        tile = np.zeros((radius, radius), dtype=np.uint8)
+        cv2.circle(tile, (0, 0), radius, 255, -1)
+        _corner_tile_cache[radius] = tile
+    return tile
 
 
 def _get_cached_mask(h: int, w: int, radius: int) -> np.ndarray:
-    """Get rounded rectangle mask from cache or create and cache it."""
+    """
+    Get rounded rectangle mask from cache or create and cache it (LRU eviction).
+
+    The mask is stored as a single-channel uint8 (0/255) array and built by
+    stamping one shared quarter-disk tile into the four corners — four array
+    slice assignments instead of six OpenCV draw calls per miss.
+    """
     key = (h, w, radius)
-    
-    if key not in _mask_cache:
-        if len(_mask_cache) > MAX_CACHE_SIZE:
-            _mask_cache.clear()
-        
-        mask = np.zeros((h, w), dtype=np.uint8)
-        cv2.rectangle(mask, (radius, 0), (w - radius, h), 255, -1)
-        cv2.rectangle(mask, (0, radius), (w, h - radius), 255, -1)
-        cv2.circle(mask, (radius, radius), radius, 255, -1)
-        cv2.circle(mask, (w - radius, radius), radius, 255, -1)
-        cv2.circle(mask, (radius, h - radius), radius, 255, -1)
-        cv2.circle(mask, (w - radius, h - radius), radius, 255, -1)
-        
-        _mask_cache[key] = cv2.cvtColor(mask, cv2.COLOR_GRAY2BGR) / 255.0
-    
-    return _mask_cache[key]
+    mask = _mask_cache.get(key)
+
+    if mask is None:
+        if len(_mask_cache) >= MAX_CACHE_SIZE:
+            _mask_cache.popitem(last=False)
+
+        mask = np.full((h, w), 255, dtype=np.uint8)
+        r = radius
+        if 0 < r <= min(h, w) // 2:
+            tile = _get_corner_tile(r)
+            mask[:r, :r] = tile[::-1, ::-1]
+            mask[:r, w - r:] = tile[::-1, :]
+            mask[h - r:, :r] = tile[:, ::-1]
+            mask[h - r:, w - r:] = tile
+
+        _mask_cache[key] = mask
+    else:
+        _mask_cache.move_to_end(key)
+
+    return mask
+
+
+# Pre-rasterized key labels: (text, scale, thickness, color) -> (tile, mask, w, h)
+# putText re-rasterizes glyphs on every call, so each label is rendered once
+# into a small tile and blitted with a mask afterwards.
+_label_tile_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+
+def _get_label_tile(text: str, font_scale: float, thickness: int,
+                    color: tuple) -> tuple:
+    """Get a pre-rasterized label tile from cache or render and cache it (LRU)."""
+    key = (text, font_scale, thickness, color)
+    entry = _label_tile_cache.get(key)
+
+    if entry is None:
+        if len(_label_tile_cache) >= MAX_CACHE_SIZE:
+            _label_tile_cache.popitem(last=False)
+
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        (tw, th), baseline = cv2.getTextSize(text, font, font_scale, thickness)
+        tile = np.zeros((th + baseline, max(tw, 1), 3), dtype=np.uint8)
+        mask = np.zeros((th + baseline, max(tw, 1)), dtype=np.uint8)
+        cv2.putText(tile, text, (0, th), font, font_scale, color, thickness)
+        cv2.putText(mask, text, (0, th), font, font_scale, 255, thickness)
+
+        entry = (tile, mask, tw, th)
+        _label_tile_cache[key] = entry
+    else:
+        _label_tile_cache.move_to_end(key)
+
+    return entry
+
+
+def draw_cached_text(img, text: str, org: Tuple[int, int],
+                     font_scale: float = 0.5,
+                     color: Tuple[int, int, int] = (255, 255, 255),
+                     thickness: int = 1):
+    """
+    Draw text through the pre-rasterized label tile cache.
+
+    Drop-in for cv2.putText with FONT_HERSHEY_SIMPLEX: each distinct
+    string is rasterized once into a tile and composited afterwards, so
+    strings that repeat across frames (HUD lines, instructions) cost a
+    small ROI blend instead of stroke rasterization. The tile is the
+    glyphs premultiplied over black and the mask their coverage, so the
+    composite reproduces putText's anti-aliased edges within rounding.
+
+    Args:
+        img: Destination image
+        text: String to draw
+        org: (x, y) baseline-left origin, as in cv2.putText
+        font_scale: Font scale
+        color: Text color (BGR)
+        thickness: Stroke thickness
+    """
+    if not text:
+        return
+    tile, mask, tw, th = _get_label_tile(text, font_scale, thickness, color)
+    x, y = org[0], org[1] - th
+    h, w = tile.shape[:2]
+    x1, y1 = max(0, x), max(0, y)
+    x2 = min(img.shape[1], x + w)
+    y2 = min(img.shape[0], y + h)
+    if x2 <= x1 or y2 <= y1:
+        return
+    roi = img[y1:y2, x1:x2]
+    inv = cv2.cvtColor(cv2.LUT(mask[y1 - y:y2 - y, x1 - x:x2 - x],
+                               _INVERT_LUT), cv2.COLOR_GRAY2BGR)
+    cv2.multiply(roi, inv, dst=roi, scale=1.0 / 255.0)
+    cv2.add(roi, tile[y1 - y:y2 - y, x1 - x:x2 - x], dst=roi)
+
+
+# Blend weight maps for cv2.blendLinear: (h, w, radius, alpha) -> (w1, w2)
+_blend_weight_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+
+def _get_cached_blend_weights(h: int, w: int, radius: int, alpha: float) -> tuple:
+    """Get (foreground, background) float32 weight maps from cache (LRU eviction)."""
+    key = (h, w, radius, alpha)
+    weights = _blend_weight_cache.get(key)
+
+    if weights is None:
+        if len(_blend_weight_cache) >= MAX_CACHE_SIZE:
+            _blend_weight_cache.popitem(last=False)
+
+        mask = _get_cached_mask(h, w, radius)
+        w1 = mask.astype(np.float32) * (alpha / 255.0)
+        weights = (w1, 1.0 - w1)
+        _blend_weight_cache[key] = weights
+    else:
+        _blend_weight_cache.move_to_end(key)
+
+    return weights
 
 
 def clear_gradient_cache():
     """Clear gradient and mask caches (call when theme changes)."""
     _gradient_cache.clear()
+    _gradient_slots.clear()
+    _gradient_free_slots[:] = range(MAX_CACHE_SIZE)
     _mask_cache.clear()
+    _blend_weight_cache.clear()
+    _static_layer_cache.clear()
+    _label_tile_cache.clear()
+    _key_sprite_cache.clear()
+    _frame_overlay_cache.clear()
+    _umat_cache.clear()
+    _hit_test_cache.clear()
 
 
 def draw_rounded_rect_gradient(img, top_left: Tuple[int, int], bottom_right: Tuple[int, int],
@@ -105,11 +273,10 @@ def draw_rounded_rect_gradient(img, top_left: Tuple[int, int], bottom_right: Tup
     """
     Draw a rounded rectangle with vertical gradient (cached for performance).
     """
-    theme = get_theme()
     if color_top is None:
-        color_top = theme['key_bg']
+        color_top = ACTIVE_THEME['key_bg']
     if color_bottom is None:
-        color_bottom = theme['key_bg_gradient']
+        color_bottom = ACTIVE_THEME['key_bg_gradient']
     
     x1, y1 = top_left
     x2, y2 = bottom_right
@@ -119,15 +286,19 @@ def draw_rounded_rect_gradient(img, top_left: Tuple[int, int], bottom_right: Tup
     if w <= 0 or h <= 0:
         return
     
-    # Get cached gradient and mask
+    # Single fused SIMD blend, no Python-level float temporaries
     gradient = _get_cached_gradient(h, w, color_top, color_bottom)
-    mask_3ch = _get_cached_mask(h, w, radius)
-    
-    # Blend with original image
     roi = img[y1:y2, x1:x2]
-    if roi.shape[:2] == gradient.shape[:2]:
-        blended = (gradient * mask_3ch * alpha + roi * (1 - mask_3ch * alpha)).astype(np.uint8)
-        img[y1:y2, x1:x2] = blended
+    if roi.shape[:2] != gradient.shape[:2]:
+        return
+
+    if NUMBA_AVAILABLE:
+        # Fixed-point JIT kernel: in-place, no weight maps needed
+        blend_rounded_rect(roi, gradient, _get_cached_mask(h, w, radius),
+                           int(alpha * 257))
+    else:
+        weights_fg, weights_bg = _get_cached_blend_weights(h, w, radius, alpha)
+        roi[:] = cv2.blendLinear(gradient, roi, weights_fg, weights_bg)
 
 
 def draw_glow_border(img, top_left: Tuple[int, int], bottom_right: Tuple[int, int],
@@ -144,24 +315,98 @@ def draw_glow_border(img, top_left: Tuple[int, int], bottom_right: Tuple[int, in
         thickness: Border thickness
         glow_size: Size of glow effect
     """
-    theme = get_theme()
     if color is None:
-        color = theme['glow_color']
+        color = ACTIVE_THEME['glow_color']
     
     x1, y1 = top_left
     x2, y2 = bottom_right
-    
+
+    # Operate on the glow bounding ROI only — copying the full frame per
+    # glow layer is pure memory traffic
+    gx1, gy1 = max(0, x1 - glow_size), max(0, y1 - glow_size)
+    gx2 = min(img.shape[1], x2 + glow_size)
+    gy2 = min(img.shape[0], y2 + glow_size)
+    if gx2 <= gx1 or gy2 <= gy1:
+        return
+
+    roi = img[gy1:gy2, gx1:gx2]
+    rx1, ry1 = x1 - gx1, y1 - gy1
+    rx2, ry2 = x2 - gx1, y2 - gy1
+
     # Draw outer glow layers (fading)
     for i in range(glow_size, 0, -2):
         alpha = 0.1 * (glow_size - i) / glow_size
-        overlay = img.copy()
-        cv2.rectangle(overlay, (x1 - i, y1 - i), (x2 + i, y2 + i), color, 2)
-        cv2.addWeighted(overlay, alpha, img, 1 - alpha, 0, img)
-    
+        overlay = roi.copy()
+        cv2.rectangle(overlay, (rx1 - i, ry1 - i), (rx2 + i, ry2 + i), color, 2)
+        cv2.addWeighted(overlay, alpha, roi, 1 - alpha, 0, roi)
+
     # Draw solid border
     cv2.rectangle(img, top_left, bottom_right, color, thickness)
 
 
+# 256-entry LUTs for the uint8 compositing pipeline: scale a coverage byte
+# by the key opacity, and invert an alpha byte. cv2.LUT only supports
+# single-input 256-entry tables, so per-pixel (roi, mask) products stay on
+# the SIMD multiply path instead
+KEY_ALPHA = 0.85  # Matches draw_rounded_rect_gradient default
+_ALPHA_SCALE_LUT = (np.arange(256) * KEY_ALPHA + 0.5).astype(np.uint8)
+_INVERT_LUT = (255 - np.arange(256)).astype(np.uint8)
+
+
+# Fully composed key sprites (body gradient + label, premultiplied) so an
+# active key draw is a two-op uint8 composite instead of blend + text blit
+_key_sprite_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+
+def _get_key_sprite(w: int, h: int, text: str, color_top: tuple,
+                    color_bottom: tuple, text_color: tuple) -> tuple:
+    """Get a premultiplied (sprite, inv_q8) key sprite from cache (LRU)."""
+    key = (w, h, text, color_top, color_bottom, text_color)
+    entry = _key_sprite_cache.get(key)
+
+    if entry is None:
+        if len(_key_sprite_cache) >= MAX_CACHE_SIZE:
+            _key_sprite_cache.popitem(last=False)
+
+        gradient = _get_cached_gradient(h, w, color_top, color_bottom)
+        mask = _get_cached_mask(h, w, 12)
+        sprite = cv2.bitwise_and(gradient, gradient, mask=mask)
+        alpha_u8 = cv2.LUT(mask, _ALPHA_SCALE_LUT)
+
+        font_scale, thickness = _font_for_label(text)
+        tile, text_mask, tw, th = _get_label_tile(text, font_scale, thickness,
+                                                  text_color)
+        text_x = (w - tw) // 2
+        text_y = (h + th) // 2
+        top, bottom = text_y - th, text_y - th + tile.shape[0]
+        right = text_x + tile.shape[1]
+        if top >= 0 and text_x >= 0 and bottom <= h and right <= w:
+            cv2.copyTo(tile, text_mask, sprite[top:bottom, text_x:right])
+            np.maximum(alpha_u8[top:bottom, text_x:right], text_mask,
+                       out=alpha_u8[top:bottom, text_x:right])
+
+        alpha3 = np.repeat(alpha_u8[:, :, np.newaxis], 3, axis=2)
+        premul = cv2.multiply(sprite, alpha3, scale=1.0 / 255.0)
+        inv_q8 = cv2.LUT(alpha3, _INVERT_LUT)
+        entry = (premul, inv_q8)
+        _key_sprite_cache[key] = entry
+    else:
+        _key_sprite_cache.move_to_end(key)
+
+    return entry
+
+
+def _font_for_label(text: str) -> Tuple[float, int]:
+    """Get (font_scale, thickness) for a key label based on its length."""
+    if len(text) > 4:
+        return 0.8, 2
+    elif len(text) > 2:
+        return 1.0, 2
+    elif len(text) == 2:
+        return 1.3, 3
+    return 1.8, 3
+
+
 def draw_key(img, pos: Tuple[int, int], text: str, highlight: bool = False,
              hover: bool = False, width: int = 90, height: int = 90,
              theme_name: str = None):
@@ -181,47 +426,250 @@ def draw_key(img, pos: Tuple[int, int], text: str, highlight: bool = False,
     theme = get_theme(theme_name)
     x, y = pos
     w, h = width, height
-    font = cv2.FONT_HERSHEY_SIMPLEX
-    
-    # Determine colors based on state
+
+    # Determine colors based on state (gradient bottoms precomputed per theme)
     if highlight:
         color_top = theme['key_pressed']
-        color_bottom = tuple(max(0, c - 50) for c in theme['key_pressed'])
+        color_bottom = theme['key_pressed_bottom']
     elif hover:
         color_top = theme['key_hover']
-        color_bottom = tuple(max(0, c - 30) for c in theme['key_hover'])
+        color_bottom = theme['key_hover_bottom']
     else:
         color_top = theme['key_bg']
         color_bottom = theme['key_bg_gradient']
     
-    # Draw gradient background
-    draw_rounded_rect_gradient(img, (x, y), (x + w, y + h), radius=12,
-                               color_top=color_top, color_bottom=color_bottom)
-    
+    # Composite the precomposed key sprite (body + label) in two uint8 ops
+    roi = img[y:y + h, x:x + w]
+    if roi.shape[0] != h or roi.shape[1] != w:
+        return  # Key falls outside the frame
+
+    premul, inv_q8 = _get_key_sprite(w, h, text, color_top, color_bottom,
+                                     theme['key_text'])
+    cv2.multiply(roi, inv_q8, dst=roi, scale=1.0 / 255.0)
+    cv2.add(roi, premul, dst=roi)
+
     # Add glow effect on hover
     if hover:
         draw_glow_border(img, (x, y), (x + w, y + h), theme['glow_color'])
-    
-    # Adjust font size based on text length
-    if len(text) > 4:
-        font_scale = 0.8
-        thickness = 2
-    elif len(text) > 2:
-        font_scale = 1.0
-        thickness = 2
-    elif len(text) == 2:
-        font_scale = 1.3
-        thickness = 3
+
+
+# === Static Keyboard Layer ===
+# The idle keyboard never changes between theme/layout/scale switches, so it is
+# rendered once into an off-screen layer and composited per frame with a single
+# vectorized blend. Only hovered/flashed keys are redrawn on top.
+_static_layer_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+
+def _build_static_keyboard(keys: List[Tuple[int, int, int, int, str]],
+                           frame_h: int, frame_w: int,
+                           theme_name: str = None) -> tuple:
+    """Render all idle keys into an off-screen layer with an alpha map."""
+    theme = get_theme(theme_name)
+    layer = np.zeros((frame_h, frame_w, 3), dtype=np.uint8)
+    alpha = np.zeros((frame_h, frame_w), dtype=np.uint8)
+
+    min_x, min_y = frame_w, frame_h
+    max_x, max_y = 0, 0
+
+    for x, y, w, h, label in keys:
+        if x < 0 or y < 0 or x + w > frame_w or y + h > frame_h:
+            continue  # Key falls outside the frame
+
+        # Opaque key body against black; blending happens at composite time
+        gradient = _get_cached_gradient(h, w, theme['key_bg'], theme['key_bg_gradient'])
+        mask = _get_cached_mask(h, w, 12)
+        layer[y:y + h, x:x + w] = cv2.bitwise_and(gradient, gradient, mask=mask)
+        np.maximum(alpha[y:y + h, x:x + w], cv2.LUT(mask, _ALPHA_SCALE_LUT),
+                   out=alpha[y:y + h, x:x + w])
+
+        # Key label via the shared tile cache (text is opaque, matching
+        # draw_key drawing after the blend); metrics come from the cache,
+        # so rebuilds never re-run getTextSize/putText for known labels
+        font_scale, thickness = _font_for_label(label)
+        tile, text_mask, tw, th = _get_label_tile(label, font_scale, thickness,
+                                                  theme['key_text'])
+        text_x = x + (w - tw) // 2
+        text_y = y + (h + th) // 2
+        top, bottom = text_y - th, text_y - th + tile.shape[0]
+        right = text_x + tile.shape[1]
+        if top >= 0 and text_x >= 0 and bottom <= frame_h and right <= frame_w:
+            cv2.copyTo(tile, text_mask, layer[top:bottom, text_x:right])
+            np.maximum(alpha[top:bottom, text_x:right], text_mask,
+                       out=alpha[top:bottom, text_x:right])
+
+        min_x, min_y = min(min_x, x), min(min_y, y)
+        max_x, max_y = max(max_x, x + w), max(max_y, y + h)
+
+    if min_x >= max_x or min_y >= max_y:
+        return None, None, (0, 0, 0, 0)
+
+    # Crop to the keyboard bounding box and derive the uint8 integer path:
+    # a premultiplied foreground (layer * alpha) and LUT-inverted 8-bit
+    # weights, so the build as well as the per-frame composite run entirely
+    # in OpenCV's saturating uint8 SIMD arithmetic with no float maps
+    bbox = (min_x, min_y, max_x, max_y)
+    layer_crop = layer[min_y:max_y, min_x:max_x]
+    alpha3 = np.repeat(alpha[min_y:max_y, min_x:max_x, np.newaxis], 3, axis=2)
+    premul = cv2.multiply(layer_crop, alpha3, scale=1.0 / 255.0)
+    inv_q8 = cv2.LUT(alpha3, _INVERT_LUT)
+
+    return premul, inv_q8, bbox
+
+
+def get_static_keyboard(keys: List[Tuple[int, int, int, int, str]],
+                        frame_shape: tuple, theme_name: str = None) -> tuple:
+    """
+    Get the pre-rendered idle keyboard for the given layout and frame size.
+
+    Returns:
+        Tuple of (premul, inv_q8, bbox) where premul is the alpha-
+        premultiplied BGR crop of all idle keys, inv_q8 holds the uint8
+        inverse blend weights, and bbox is (x1, y1, x2, y2) bounding the
+        keyboard area. Cached per (layout, theme, frame size).
+    """
+    cache_key = (tuple(keys), theme_name, frame_shape[0], frame_shape[1])
+
+    entry = _static_layer_cache.get(cache_key)
+    if entry is None:
+        if len(_static_layer_cache) >= 4:
+            _static_layer_cache.popitem(last=False)
+        entry = _build_static_keyboard(keys, frame_shape[0], frame_shape[1], theme_name)
+        _static_layer_cache[cache_key] = entry
     else:
-        font_scale = 1.8
-        thickness = 3
-    
-    # Draw text centered on key
-    text_color = theme['key_text']
-    text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
-    text_x = x + (w - text_size[0]) // 2
-    text_y = y + (h + text_size[1]) // 2
-    cv2.putText(img, text, (text_x, text_y), font, font_scale, text_color, thickness)
+        _static_layer_cache.move_to_end(cache_key)
+
+    return entry
+
+
+# Uploaded cv2.UMat copies of the static-layer arrays, keyed by array id so
+# each cached layer hits the device exactly once. A finalizer on the host
+# array drops its device copy the moment the owning cache entry is evicted
+# and freed — ids can be reused by later allocations, so an entry must
+# never outlive the array it was keyed on.
+_umat_cache: Dict[int, 'cv2.UMat'] = {}
+
+
+def _get_umat(arr: np.ndarray) -> 'cv2.UMat':
+    """Get (or upload) the device-side copy of a cached layer array."""
+    key = id(arr)
+    umat = _umat_cache.get(key)
+    if umat is None:
+        umat = cv2.UMat(arr)
+        _umat_cache[key] = umat
+        weakref.finalize(arr, _umat_cache.pop, key, None)
+    return umat
+
+
+def composite_static_keyboard(img, premul: np.ndarray, inv_q8: np.ndarray,
+                              bbox: Tuple[int, int, int, int]):
+    """Blend the pre-rendered keyboard layer onto a frame (uint8 SIMD path)."""
+    x1, y1, x2, y2 = bbox
+    if x2 <= x1 or y2 <= y1:
+        return
+
+    # roi = roi * (1 - alpha) + layer * alpha, all in 8-bit arithmetic
+    if OPENCL_ACTIVE:
+        # Upload the keyboard ROI, blend on-device, download only the ROI
+        uroi = cv2.UMat(img[y1:y2, x1:x2])
+        cv2.multiply(uroi, _get_umat(inv_q8), dst=uroi, scale=1.0 / 255.0)
+        cv2.add(uroi, _get_umat(premul), dst=uroi)
+        img[y1:y2, x1:x2] = uroi.get()
+        return
+
+    roi = img[y1:y2, x1:x2]
+    cv2.multiply(roi, inv_q8, dst=roi, scale=1.0 / 255.0)
+    cv2.add(roi, premul, dst=roi)
+
+
+# Fully flattened keyboard overlays keyed by interaction state. Hover and
+# flash states recur constantly (idle being the overwhelming case), so each
+# state's composited layer is built once and replayed as a single blend.
+_frame_overlay_cache: 'OrderedDict[tuple, tuple]' = OrderedDict()
+
+
+def render_keyboard(img, keys: List[Tuple[int, int, int, int, str]],
+                    hovered_key: str = None, flashed: set = None,
+                    shift_active: bool = False, theme_name: str = None):
+    """
+    Render the full keyboard in one pass.
+
+    The flattened overlay for the current (hover, flash, shift, theme)
+    state is fetched from a small LRU cache and composited with a single
+    blend; a state change rebuilds it once via the incremental path.
+
+    Args:
+        img: Frame to draw on
+        keys: Key list from generate_keyboard_layout
+        hovered_key: Label of the currently hovered key, if any
+        flashed: Set of labels currently showing the press flash
+        shift_active: Whether SHIFT is latched
+        theme_name: Optional theme override
+    """
+    state = (tuple(keys), img.shape[0], img.shape[1], hovered_key,
+             frozenset(flashed) if flashed else None, shift_active, theme_name)
+    entry = _frame_overlay_cache.get(state)
+
+    if entry is None:
+        if len(_frame_overlay_cache) >= 8:
+            _frame_overlay_cache.popitem(last=False)
+        entry = _build_frame_overlay(img.shape, keys, hovered_key, flashed,
+                                     shift_active, theme_name)
+        _frame_overlay_cache[state] = entry
+    else:
+        _frame_overlay_cache.move_to_end(state)
+
+    composite_static_keyboard(img, *entry)
+
+
+def _render_keyboard_pass(img, keys, hovered_key, flashed, shift_active,
+                          theme_name):
+    """Composite the idle layer, then redraw only state-differing keys."""
+    premul, inv_q8, bbox = get_static_keyboard(keys, img.shape, theme_name)
+    composite_static_keyboard(img, premul, inv_q8, bbox)
+
+    for x, y, w, h, label in keys:
+        highlight = (flashed is not None and label in flashed) or \
+                    (label == 'SHIFT' and shift_active)
+        hover = label == hovered_key
+
+        if highlight or hover:
+            draw_key(img, (x, y), label, highlight=highlight, hover=hover,
+                     width=int(w), height=int(h), theme_name=theme_name)
+
+
+# Extra margin around the key bbox so hover glow survives the overlay crop
+_OVERLAY_PAD = 16
+
+
+def _build_frame_overlay(frame_shape, keys, hovered_key, flashed,
+                         shift_active, theme_name) -> tuple:
+    """
+    Flatten a full interaction state into one (premul, inv_q8, bbox) layer.
+
+    Every per-pixel operation in the render pass is an affine function of
+    the background (out = premul + bg * inv / 255), so running the pass
+    over an all-black and an all-white frame recovers the exact layer:
+    black yields the premultiplied term, white-minus-black the inverse
+    weights. The flattened layer then composites in a single blend per
+    frame until the hover/flash/shift state changes.
+    """
+    frame_h, frame_w = frame_shape[0], frame_shape[1]
+    _, _, bbox = get_static_keyboard(keys, frame_shape, theme_name)
+    x1 = max(0, bbox[0] - _OVERLAY_PAD)
+    y1 = max(0, bbox[1] - _OVERLAY_PAD)
+    x2 = min(frame_w, bbox[2] + _OVERLAY_PAD)
+    y2 = min(frame_h, bbox[3] + _OVERLAY_PAD)
+
+    black = np.zeros((frame_h, frame_w, 3), dtype=np.uint8)
+    white = np.full((frame_h, frame_w, 3), 255, dtype=np.uint8)
+    _render_keyboard_pass(black, keys, hovered_key, flashed, shift_active,
+                          theme_name)
+    _render_keyboard_pass(white, keys, hovered_key, flashed, shift_active,
+                          theme_name)
+
+    premul = black[y1:y2, x1:x2].copy()
+    inv_q8 = cv2.subtract(white[y1:y2, x1:x2], premul)
+    return premul, inv_q8, (x1, y1, x2, y2)
 
 
 def draw_rounded_rect(img, top_left: Tuple[int, int], bottom_right: Tuple[int, int],
@@ -229,17 +677,84 @@ def draw_rounded_rect(img, top_left: Tuple[int, int], bottom_right: Tuple[int, i
                       thickness: int = -1):
     """
     Draw a rounded rectangle (legacy function for compatibility).
+
+    Outlines are drawn directly into the image; only filled mode goes
+    through the alpha-blended gradient path.
     """
+    x1, y1 = top_left
+    x2, y2 = bottom_right
+
+    if radius <= 0:
+        cv2.rectangle(img, top_left, bottom_right, color, thickness)
+        return
+
+    if thickness != -1:
+        # Outline mode: edges and corner arcs in place, no overlay copy/blend
+        cv2.line(img, (x1 + radius, y1), (x2 - radius, y1), color, thickness)
+        cv2.line(img, (x1 + radius, y2), (x2 - radius, y2), color, thickness)
+        cv2.line(img, (x1, y1 + radius), (x1, y2 - radius), color, thickness)
+        cv2.line(img, (x2, y1 + radius), (x2, y2 - radius), color, thickness)
+        cv2.ellipse(img, (x1 + radius, y1 + radius), (radius, radius), 180, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y1 + radius), (radius, radius), 270, 0, 90, color, thickness)
+        cv2.ellipse(img, (x1 + radius, y2 - radius), (radius, radius), 90, 0, 90, color, thickness)
+        cv2.ellipse(img, (x2 - radius, y2 - radius), (radius, radius), 0, 0, 90, color, thickness)
+        return
+
     draw_rounded_rect_gradient(img, top_left, bottom_right, radius,
                                color_top=color, color_bottom=color)
 
 
+# SoA key geometry per layout for the vectorized hover hit-test. Entries
+# hold a strong reference to the keys list, so the id() key stays valid for
+# as long as the entry lives.
+_hit_test_cache: 'OrderedDict[int, tuple]' = OrderedDict()
+
+
+def hit_test(keys: List[Tuple[int, int, int, int, str]],
+             x: int, y: int) -> Optional[str]:
+    """
+    Return the label of the key containing point (x, y), or None.
+
+    Key rectangles are cached as contiguous int32 arrays per layout list,
+    so the containment test is one vectorized pass over all keys instead
+    of a Python-level loop per frame.
+    """
+    if not keys:
+        return None
+
+    entry = _hit_test_cache.get(id(keys))
+    if entry is None or entry[0] is not keys:
+        if len(_hit_test_cache) >= 16:
+            _hit_test_cache.popitem(last=False)
+        rects = np.asarray([k[:4] for k in keys], dtype=np.int32)
+        kx, ky = rects[:, 0], rects[:, 1]
+        entry = (keys, kx, ky, kx + rects[:, 2], ky + rects[:, 3],
+                 [k[4] for k in keys])
+        _hit_test_cache[id(keys)] = entry
+    else:
+        _hit_test_cache.move_to_end(id(keys))
+
+    _, kx, ky, kx2, ky2, labels = entry
+    idx = np.flatnonzero((kx < x) & (x < kx2) & (ky < y) & (y < ky2))
+    if idx.size:
+        return labels[int(idx[0])]
+    return None
+
+
+# Generated layouts keyed on (layout, start_x, start_y, key_width, key_height, gap)
+_layout_cache: 'OrderedDict[tuple, list]' = OrderedDict()
+
+
 def generate_keyboard_layout(start_x: int = 50, start_y: int = 100,
                             key_width: int = 85, key_height: int = 85,
                             gap: int = 12, layout: str = None) -> List[Tuple[int, int, int, int, str]]:
     """
     Generate keyboard key positions and dimensions.
-    
+
+    Positions are computed row-by-row with a NumPy cumulative sum over the
+    key widths, and results are cached per argument set since layouts only
+    change on resize or layout toggle.
+
     Args:
         start_x: Starting X position
         start_y: Starting Y position
@@ -247,42 +762,61 @@ def generate_keyboard_layout(start_x: int = 50, start_y: int = 100,
         key_height: Height of keys
         gap: Gap between keys
         layout: 'qwerty' or 'numpad' (uses current if None)
-    
+
     Returns:
         List of tuples: (x, y, width, height, label)
     """
     if layout is None:
         layout = _current_layout
-    
+
+    cache_key = (layout, start_x, start_y, key_width, key_height, gap)
+    keys = _layout_cache.get(cache_key)
+    if keys is not None:
+        _layout_cache.move_to_end(cache_key)
+        return keys
+
     symbols = KEYBOARD_SYMBOLS if layout == 'qwerty' else NUMPAD_SYMBOLS
     keys = []
-    
+
     for row_index, row in enumerate(symbols):
         # Center each row with staggered offset (only for qwerty)
         row_offset = row_index * 25 if layout == 'qwerty' else 0
         y = start_y + row_index * (key_height + gap)
-        
-        current_x = start_x + row_offset
-        
-        for col_index, key in enumerate(row):
-            # Calculate key width first
-            if key == '__':
-                w = int(key_width * 2.5)
-            elif key in ['ENTER', 'SHIFT', 'CAPS', '<-']:
-                w = int(key_width * 1.5)
-            elif key in ['TAB', 'NUM', 'ABC']:
-                w = int(key_width * 1.2)
-            else:
-                w = key_width
-                
-            keys.append((current_x, y, w, key_height, key))
-            
-            # Update x for next key
-            current_x += w + gap
-    
+
+        widths = np.array([int(key_width * SPECIAL_WIDTHS.get(key, 1.0)) for key in row],
+                          dtype=np.int64)
+        xs = start_x + row_offset + np.concatenate(([0], np.cumsum(widths[:-1] + gap)))
+
+        keys.extend(zip(xs.tolist(), [y] * len(row), widths.tolist(),
+                        [key_height] * len(row), row))
+
+    if len(_layout_cache) >= 16:
+        _layout_cache.popitem(last=False)
+    _layout_cache[cache_key] = keys
+
     return keys
 
 
+# Sanitized display-tail memo for draw_text_bar. The typed text only
+# changes on key events, so the per-frame replace/slice pair (two string
+# copies of the full text) is recomputed only then; in between the string
+# identity fast-path makes the comparison O(1).
+_display_tail_memo: tuple = (None, -1, '')
+
+
+def _get_display_tail(text: str, max_chars: int) -> str:
+    """Sanitize and truncate the typed text for display (memoized)."""
+    global _display_tail_memo
+    src, mc, tail = _display_tail_memo
+    if src == text and mc == max_chars:
+        return tail
+    tail = text.replace('\n', '↵ ').replace('\t', '→   ')
+    if len(tail) > max_chars:
+        tail = '◀ ' + tail[-(max_chars - 2):]
+    _display_tail_memo = (text, max_chars, tail)
+    return tail
+
+
 def draw_text_bar(img, text: str, screen_width: int, y_pos: int = 20,
                   theme_name: str = None):
     """
@@ -292,22 +826,16 @@ def draw_text_bar(img, text: str, screen_width: int, y_pos: int = 20,
     theme = get_theme(theme_name)
     text_bar_width = int(screen_width * 0.85)
     bar_height = 55
-    
+
     # Draw gradient background
     draw_rounded_rect_gradient(img, (40, y_pos), (40 + text_bar_width, y_pos + bar_height),
                                radius=10, color_top=theme['text_bar_bg'],
-                               color_bottom=tuple(max(0, c - 20) for c in theme['text_bar_bg']))
-    
-    # Display text (replace newlines/tabs for display)
-    display_text = text.replace('\n', '↵ ').replace('\t', '→   ')
-    
-    # Calculate max chars based on screen width
+                               color_bottom=theme['text_bar_bg_bottom'])
+
+    # Display text (newlines/tabs replaced, tail-truncated, memoized)
     max_chars = min(70, text_bar_width // 14)
-    is_truncated = len(display_text) > max_chars
-    
-    if is_truncated:
-        display_text = '◀ ' + display_text[-(max_chars - 2):]
-    
+    display_text = _get_display_tail(text, max_chars)
+
     # Main text
     cv2.putText(img, display_text, (55, y_pos + 38),
                cv2.FONT_HERSHEY_SIMPLEX, 0.9, theme['text_bar_text'], 2)
@@ -318,11 +846,35 @@ def draw_text_bar(img, text: str, screen_width: int, y_pos: int = 20,
                cv2.FONT_HERSHEY_SIMPLEX, 0.4, (150, 150, 150), 1)
 
 
+# Status-bar font metrics, measured once: the space advance (difference of
+# two renders, since getTextSize pads single glyphs) plus a width cache for
+# the small, highly repetitive set of status strings (FPS values, names)
+_STATUS_FONT = (cv2.FONT_HERSHEY_SIMPLEX, 0.6, 2)
+_STATUS_SPACE_W = max(1, cv2.getTextSize('a a', *_STATUS_FONT)[0][0] -
+                      cv2.getTextSize('aa', *_STATUS_FONT)[0][0])
+_status_width_cache: Dict[str, int] = {}
+
+
+def _status_text_width(text: str) -> int:
+    """Pixel width of a status-bar segment (cached per string)."""
+    width = _status_width_cache.get(text)
+    if width is None:
+        if len(_status_width_cache) >= MAX_CACHE_SIZE:
+            _status_width_cache.clear()
+        width = cv2.getTextSize(text, *_STATUS_FONT)[0][0]
+        _status_width_cache[text] = width
+    return width
+
+
 def draw_status_bar(img, fps: int, theme_name: str, screen_width: int,
                     screen_height: int, notification: str = ""):
     """
     Draw status bar at bottom of screen.
-    
+
+    FPS, notification and theme segments are padded with spaces into one
+    string so the whole strip is a single cv2.putText glyph pass instead
+    of three.
+
     Args:
         img: Image to draw on
         fps: Current FPS
@@ -333,16 +885,18 @@ def draw_status_bar(img, fps: int, theme_name: str, screen_width: int,
     """
     theme = get_theme(theme_name)
     y = screen_height - 40
-    
-    # FPS indicator
-    cv2.putText(img, f"FPS: {fps}", (15, y),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme['indicator_ready'], 2)
-    
-    # Theme indicator
-    cv2.putText(img, f"Theme: {theme_name.title()}", (screen_width - 180, y),
-               cv2.FONT_HERSHEY_SIMPLEX, 0.6, theme['key_text'], 2)
-    
-    # Notification
+
+    line = f"FPS: {fps}"
+    cursor = 15 + _status_text_width(line)
+
     if notification:
-        cv2.putText(img, notification, (screen_width // 2 - 100, y),
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, theme['indicator_ready'], 2)
+        pad = max(1, (screen_width // 2 - 100 - cursor) // _STATUS_SPACE_W)
+        line += ' ' * pad + notification
+        cursor += pad * _STATUS_SPACE_W + _status_text_width(notification)
+
+    segment = f"Theme: {theme_name.title()}"
+    pad = max(1, (screen_width - 180 - cursor) // _STATUS_SPACE_W)
+    line += ' ' * pad + segment
+
+    cv2.putText(img, line, (15, y), cv2.FONT_HERSHEY_SIMPLEX, 0.6,
+                theme['key_text'], 2)
@@ -46,6 +46,14 @@ MAX_HANDS = 2  # Maximum number of hands to detect
 BORDER_RADIUS = 20  # Corner radius for rounded rectangles (pixels)
 FLASH_DURATION = 0.3  # Duration of key flash animation (seconds)
 
+# === GPU Configuration ===
+# Opt-in: route keyboard compositing through OpenCV's T-API (cv2.UMat) so
+# the blend runs on an OpenCL device. Off by default — the CPU uint8 path
+# is already fast, and whether the UMat round-trip wins depends on the
+# machine's GPU/driver, so enable it after measuring on the target box.
+# Ignored when the OpenCV build has no OpenCL support.
+USE_GPU = False
+
 # === Color Schemes (BGR format) ===
 COLORS = {
     'key_default': (0, 0, 0),  # Black
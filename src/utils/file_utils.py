@@ -6,14 +6,23 @@ with proper error handling, logging, and cross-platform path support.
 """
 
 import os
+import time
 import pyperclip
-from datetime import datetime
 from pathlib import Path
 from typing import Optional
 from src.utils.exceptions import FileOperationError, ClipboardError
 from src.utils.logging_config import log_info, log_warning
 
 
+# Bind the clipboard backend once at import: pyperclip resolves its
+# platform copy function lazily on first use, so binding the resolved
+# callable here lets repeated copies skip the per-call re-dispatch.
+# pyperclip's own Win32 backend already handles the pointer-sized
+# HGLOBAL/LPVOID types and failure cleanup correctly, so it is used on
+# every platform rather than hand-rolled ctypes.
+_clip_copy = pyperclip.copy
+
+
 def get_safe_path(filename: str, base_dir: Optional[str] = None) -> Path:
     """
     Get a safe, cross-platform file path.
@@ -57,7 +66,8 @@ def save_text_to_file(text: str, filename: Optional[str] = None,
         return False
     
     if filename is None:
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # time.strftime skips the datetime object construction entirely
+        timestamp = time.strftime("%Y%m%d_%H%M%S")
         filename = f"typed_text_{timestamp}.txt"
     
     try:
@@ -67,9 +77,17 @@ def save_text_to_file(text: str, filename: Optional[str] = None,
         else:
             filepath = Path(filename)
         
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write(text)
-        
+        # Encode once and write through a same-directory temp file: one
+        # buffered write + fsync, then an atomic rename, so a crash can
+        # never leave a truncated file at the destination
+        data = text.encode('utf-8')
+        tmp_path = filepath.with_name(filepath.name + '.tmp')
+        with open(tmp_path, 'wb', buffering=max(len(data) + 8, 65536)) as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, filepath)
+
         log_info(f"Text saved to {filepath}")
         return True
     except PermissionError:
@@ -96,7 +114,7 @@ def copy_to_clipboard(text: str) -> bool:
         return False
     
     try:
-        pyperclip.copy(text)
+        _clip_copy(text)
         log_info(f"Copied {len(text)} characters to clipboard")
         return True
     except Exception as e:
@@ -132,30 +150,27 @@ def load_text_from_file(filename: str) -> Optional[str]:
         raise FileOperationError(f"Failed to load file: {e}")
 
 
+# Leading characters that could trigger formula injection in spreadsheets
+_FORMULA_PREFIX_CHARS = frozenset('=+-@\t\r\n')
+
+
 def sanitize_csv_value(value: str) -> str:
     """
     Sanitize a value for safe CSV writing.
     Prevents CSV injection attacks.
-    
+
     Args:
         value: Raw value to sanitize
-        
+
     Returns:
         Sanitized value safe for CSV
     """
     if not isinstance(value, str):
         return str(value)
-    
-    # Remove characters that could be used for formula injection
-    dangerous_chars = ['=', '+', '-', '@', '\t', '\r', '\n']
-    
-    result = value
-    for char in dangerous_chars:
-        if result.startswith(char):
-            result = "'" + result  # Escape by prefixing with single quote
-            break
-    
+
+    # Escape formula-injection prefixes with a single O(1) first-char check
+    if value and value[0] in _FORMULA_PREFIX_CHARS:
+        value = "'" + value
+
     # Escape quotes
-    result = result.replace('"', '""')
-    
-    return result
+    return value.replace('"', '""')
@@ -4,78 +4,130 @@ Logging configuration for Touchless Keyboard.
 Provides structured logging with configurable levels and output formats.
 """
 
+import atexit
 import logging
 import sys
-from datetime import datetime
+import threading
 from typing import Optional
 
+# File logging is batched through MemoryHandlers so routine records cost an
+# in-memory append instead of a write() syscall; errors flush immediately.
+# One daemon timer periodically drains every registered buffer.
+_FLUSH_CAPACITY = 512
+_FLUSH_INTERVAL = 30.0
+_memory_handlers = []
+_flush_timer_started = False
 
-def setup_logger(name: str = "touchless_keyboard", 
+# Active QueueListeners per logger name, so re-running setup_logger replaces
+# the background thread instead of leaking it
+_listeners = {}
+
+
+def _stop_listener(listener):
+    """Stop a QueueListener, tolerating one that was already stopped."""
+    if listener._thread is not None:
+        listener.stop()
+
+
+def _flush_memory_handlers():
+    """Flush all buffered log handlers and reschedule the timer."""
+    for handler in _memory_handlers:
+        handler.flush()
+    timer = threading.Timer(_FLUSH_INTERVAL, _flush_memory_handlers)
+    timer.daemon = True
+    timer.start()
+
+
+def _register_memory_handler(handler):
+    """Track a MemoryHandler for periodic and at-exit flushing."""
+    global _flush_timer_started
+    _memory_handlers.append(handler)
+    atexit.register(handler.flush)
+    if not _flush_timer_started:
+        _flush_timer_started = True
+        timer = threading.Timer(_FLUSH_INTERVAL, _flush_memory_handlers)
+        timer.daemon = True
+        timer.start()
+
+
+def setup_logger(name: str = "touchless_keyboard",
                  level: int = logging.INFO,
                  log_file: Optional[str] = None) -> logging.Logger:
     """
     Set up and return a configured logger.
-    
+
+    The logger itself only carries a QueueHandler, so a log call on the
+    capture loop is an O(1) enqueue; formatting and console/file output
+    run on a QueueListener's background thread.
+
     Args:
         name: Logger name
         level: Logging level (DEBUG, INFO, WARNING, ERROR)
         log_file: Optional file path for log output
-    
+
     Returns:
         Configured Logger instance
     """
+    import queue
+    from logging.handlers import QueueHandler, QueueListener
+
     logger = logging.getLogger(name)
     logger.setLevel(level)
-    
-    # Clear existing handlers
+
+    # Clear existing handlers (and stop a listener from a previous setup)
     logger.handlers.clear()
-    
+    old_listener = _listeners.pop(name, None)
+    if old_listener is not None:
+        _stop_listener(old_listener)
+
     # Create formatter
     formatter = logging.Formatter(
         fmt='%(asctime)s | %(levelname)-8s | %(message)s',
         datefmt='%H:%M:%S'
     )
-    
+
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setLevel(level)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler (optional)
+    output_handlers = [console_handler]
+
+    # File handler (optional), buffered so routine records don't each pay a
+    # disk write; ERROR and above flush through immediately
     if log_file:
-        from logging.handlers import RotatingFileHandler
+        from logging.handlers import RotatingFileHandler, MemoryHandler
         # 1MB max size, keep 3 backup files
         file_handler = RotatingFileHandler(log_file, maxBytes=1024*1024, backupCount=3)
         file_handler.setLevel(level)
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
-    
+        mem_handler = MemoryHandler(capacity=_FLUSH_CAPACITY,
+                                    flushLevel=logging.ERROR,
+                                    target=file_handler, flushOnClose=True)
+        mem_handler.setLevel(level)
+        output_handlers.append(mem_handler)
+        _register_memory_handler(mem_handler)
+
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *output_handlers,
+                             respect_handler_level=True)
+    listener.start()
+    _listeners[name] = listener
+    atexit.register(_stop_listener, listener)
+
     return logger
 
 
 # Create default application logger
 logger = setup_logger()
 
-
-def log_info(message: str):
-    """Log info message."""
-    logger.info(message)
-
-
-def log_warning(message: str):
-    """Log warning message."""
-    logger.warning(message)
-
-
-def log_error(message: str):
-    """Log error message."""
-    logger.error(message)
-
-
-def log_debug(message: str):
-    """Log debug message."""
-    logger.debug(message)
+# Bound logger methods exposed directly — the old def wrappers added a
+# Python stack frame to every log call for no behavior. getLogger returns
+# the same object on re-setup, so these bindings stay valid.
+log_info = logger.info
+log_warning = logger.warning
+log_error = logger.error
+log_debug = logger.debug
 
 
 def set_log_level(level: str):
@@ -92,6 +144,12 @@ def set_log_level(level: str):
         'ERROR': logging.ERROR
     }
     if level.upper() in levels:
-        logger.setLevel(levels[level.upper()])
+        new_level = levels[level.upper()]
+        logger.setLevel(new_level)
         for handler in logger.handlers:
-            handler.setLevel(levels[level.upper()])
+            handler.setLevel(new_level)
+        # Output handlers live behind the QueueListener, not on the logger
+        listener = _listeners.get(logger.name)
+        if listener is not None:
+            for handler in listener.handlers:
+                handler.setLevel(new_level)
@@ -4,11 +4,18 @@ User settings persistence for Touchless Keyboard.
 Saves and loads user preferences (theme, etc.) across sessions.
 """
 
+import atexit
 import json
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 from src.utils.logging_config import log_info, log_warning
 
+try:
+    import orjson  # C-implemented encoder; optional
+except ImportError:
+    orjson = None
+
 # Default settings
 DEFAULT_SETTINGS = {
     'theme': 'dark',
@@ -22,9 +29,53 @@ DEFAULT_SETTINGS = {
     'high_contrast': False,
 }
 
+# Recognized setting keys, fixed at import
+_VALID_KEYS = frozenset(DEFAULT_SETTINGS)
+
 SETTINGS_FILE = Path.home() / '.touchless_keyboard' / 'settings.json'
 LOG_FILE = Path.home() / '.touchless_keyboard' / 'app.log'
 
+# Parsed-settings cache with an mtime guard, so repeated get_setting calls
+# don't re-open and re-parse the file; save_settings refreshes it
+_settings_cache: Optional[Dict[str, Any]] = None
+_settings_cache_mtime: float = -1.0
+
+# Debounced persistence: update_setting mutates the cache and arms a short
+# timer, so a burst of updates becomes one disk write. While changes are
+# pending the cache is authoritative over the file.
+_SAVE_DEBOUNCE = 1.0
+_settings_dirty = False
+_save_timer: Optional[threading.Timer] = None
+_save_lock = threading.Lock()
+
+
+def _flush_settings():
+    """Write any pending in-memory setting changes to disk."""
+    global _save_timer, _settings_dirty
+    with _save_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+            _save_timer = None
+        if not _settings_dirty or _settings_cache is None:
+            return
+        _settings_dirty = False
+        pending = _settings_cache.copy()
+    save_settings(pending)
+
+
+def _schedule_save():
+    """Arm (or re-arm) the debounced settings flush."""
+    global _save_timer
+    with _save_lock:
+        if _save_timer is not None:
+            _save_timer.cancel()
+        _save_timer = threading.Timer(_SAVE_DEBOUNCE, _flush_settings)
+        _save_timer.daemon = True
+        _save_timer.start()
+
+
+atexit.register(_flush_settings)
+
 
 def get_log_file_path() -> Optional[str]:
     """Get log file path if logging is enabled."""
@@ -47,29 +98,45 @@ def _ensure_config_dir() -> bool:
 def load_settings() -> Dict[str, Any]:
     """
     Load user settings from file.
-    
+
+    The parsed result is cached and reused until the file's mtime changes
+    (e.g. it was edited externally), so steady-state calls cost one stat
+    instead of an open/read/parse cycle.
+
     Returns:
         Dictionary of settings (uses defaults for missing keys)
     """
+    global _settings_cache, _settings_cache_mtime
+
+    # Unflushed in-memory changes take precedence over the file
+    if _settings_dirty and _settings_cache is not None:
+        return _settings_cache.copy()
+
+    try:
+        mtime = SETTINGS_FILE.stat().st_mtime
+    except OSError:
+        return DEFAULT_SETTINGS.copy()
+
+    if _settings_cache is not None and mtime == _settings_cache_mtime:
+        return _settings_cache.copy()
+
     settings = DEFAULT_SETTINGS.copy()
-    
-    if not SETTINGS_FILE.exists():
-        return settings
-    
     try:
-        with open(SETTINGS_FILE, 'r', encoding='utf-8') as f:
-            saved = json.load(f)
-        
-        # Merge saved settings with defaults
-        for key, value in saved.items():
-            if key in settings:
-                settings[key] = value
-        
+        raw = SETTINGS_FILE.read_bytes()
+        saved = orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+        # Merge saved settings with defaults, dropping unknown keys
+        settings.update(
+            (key, value) for key, value in saved.items() if key in _VALID_KEYS)
+
         log_info(f"Loaded settings from {SETTINGS_FILE}")
-        return settings
-    except (json.JSONDecodeError, OSError):
+    except (ValueError, OSError):
         return settings
 
+    _settings_cache = settings
+    _settings_cache_mtime = mtime
+    return settings.copy()
+
 
 def save_settings(settings: Dict[str, Any]) -> bool:
     """
@@ -81,12 +148,19 @@ def save_settings(settings: Dict[str, Any]) -> bool:
     Returns:
         True if save successful
     """
+    global _settings_cache, _settings_cache_mtime
+
     if not _ensure_config_dir():
         return False
-    
+
     try:
-        with open(SETTINGS_FILE, 'w', encoding='utf-8') as f:
-            json.dump(settings, f, indent=2)
+        if orjson is not None:
+            data = orjson.dumps(settings, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(settings, indent=2).encode('utf-8')
+        SETTINGS_FILE.write_bytes(data)
+        _settings_cache = settings.copy()
+        _settings_cache_mtime = SETTINGS_FILE.stat().st_mtime
         log_info(f"Settings saved to {SETTINGS_FILE}")
         return True
     except OSError:
@@ -111,15 +185,24 @@ def get_setting(key: str, default: Any = None) -> Any:
 
 def update_setting(key: str, value: Any) -> bool:
     """
-    Update a single setting and save.
-    
+    Update a single setting and schedule a save.
+
+    The change lands in the in-memory cache immediately; the disk write is
+    debounced so a burst of updates flushes once. Pending changes are also
+    flushed at process exit.
+
     Args:
         key: Setting key
         value: New value
-        
+
     Returns:
-        True if save successful
+        True if the update was accepted
     """
+    global _settings_cache, _settings_dirty
+
     settings = load_settings()
     settings[key] = value
-    return save_settings(settings)
+    _settings_cache = settings
+    _settings_dirty = True
+    _schedule_save()
+    return True
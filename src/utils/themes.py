@@ -5,6 +5,7 @@ Provides color themes and visual styling for the keyboard interface.
 """
 
 import numpy as np
+from types import MappingProxyType
 from typing import Dict, Tuple, Any
 
 
@@ -82,111 +83,198 @@ THEMES = {
     },
 }
 
+# Precompute theme-derived gradient bottoms once. The draw code used to
+# rebuild these tuples per key per frame with a Python generator.
+for _colors in THEMES.values():
+    _colors['key_pressed_bottom'] = tuple(max(0, c - 50) for c in _colors['key_pressed'])
+    _colors['key_hover_bottom'] = tuple(max(0, c - 30) for c in _colors['key_hover'])
+    _colors['text_bar_bg_bottom'] = tuple(max(0, c - 20) for c in _colors['text_bar_bg'])
+del _colors
+
+# NumPy mirrors of every color field, built once at import so blending code
+# can index ready-made arrays instead of converting tuples per draw call
+_THEMES_NP: Dict[str, Dict[str, np.ndarray]] = {
+    name: {k: np.asarray(v, dtype=np.uint8)
+           for k, v in colors.items() if isinstance(v, tuple)}
+    for name, colors in THEMES.items()
+}
+for _colors in _THEMES_NP.values():
+    for _arr in _colors.values():
+        _arr.flags.writeable = False
+del _colors, _arr
+
+# Freeze the theme tables: get_theme(name) hands out these mappings by
+# reference, so a caller mutating its "own" theme must not silently edit the
+# shared definition. ACTIVE_THEME stays the one mutable working dict that
+# set_theme refills in place.
+THEMES = {name: MappingProxyType(colors) for name, colors in THEMES.items()}
+
+
 # Current active theme
 _current_theme = 'dark'
 
+# Module-level binding to the active theme's colors. The dict object itself
+# is stable — set_theme swaps its contents in place — so hot draw code can
+# import it once and index it directly instead of calling get_theme() per
+# invocation.
+ACTIVE_THEME: Dict[str, Any] = dict(THEMES['dark'])
+
+# Bumped on every theme change so per-frame callers can cache get_theme()
+# results and only re-fetch when the version moves
+_theme_version = 0
+
 
 def get_theme(theme_name: str = None) -> Dict[str, Any]:
     """
     Get theme colors by name.
-    
+
     Args:
         theme_name: Theme name ('dark', 'neon', 'cyberpunk', 'light')
                    If None, returns current active theme.
-    
+
     Returns:
         Dictionary of color values
     """
-    name = theme_name or _current_theme
-    return THEMES.get(name, THEMES['dark'])
+    if theme_name is None:
+        return ACTIVE_THEME
+    return THEMES.get(theme_name, THEMES['dark'])
 
 
 def set_theme(theme_name: str) -> bool:
     """
     Set the active theme.
-    
+
     Args:
         theme_name: Theme name to activate
-    
+
     Returns:
         True if theme was set successfully
     """
-    global _current_theme
+    global _current_theme, _theme_version
     if theme_name in THEMES:
         _current_theme = theme_name
+        ACTIVE_THEME.clear()
+        ACTIVE_THEME.update(THEMES[theme_name])
+        _theme_version += 1
         return True
     return False
 
 
+def theme_version() -> int:
+    """Get the current theme version (increments on every set_theme)."""
+    return _theme_version
+
+
+def get_theme_np(theme_name: str = None) -> Dict[str, np.ndarray]:
+    """
+    Get a theme's colors as precomputed uint8 NumPy arrays.
+
+    Args:
+        theme_name: Theme name, or None for the active theme
+
+    Returns:
+        Dictionary mapping color fields to (3,) uint8 arrays
+    """
+    name = theme_name or _current_theme
+    return _THEMES_NP.get(name, _THEMES_NP['dark'])
+
+
 def get_available_themes() -> list:
     """Get list of available theme names."""
     return list(THEMES.keys())
 
 
-def create_gradient(height: int, width: int, 
-                   color_top: Tuple[int, int, int], 
-                   color_bottom: Tuple[int, int, int]) -> np.ndarray:
+def create_gradient(height: int, width: int,
+                   color_top: Tuple[int, int, int],
+                   color_bottom: Tuple[int, int, int],
+                   out: np.ndarray = None) -> np.ndarray:
     """
     Create a vertical gradient image.
-    
+
     Args:
         height: Image height
         width: Image width
         color_top: BGR color at top
         color_bottom: BGR color at bottom
-    
+        out: Optional (height, width, 3) uint8 array to write into,
+             avoiding a fresh allocation
+
     Returns:
         NumPy array with gradient
     """
-    gradient = np.zeros((height, width, 3), dtype=np.uint8)
-    
-    for y in range(height):
-        ratio = y / max(height - 1, 1)
-        b = int(color_top[0] * (1 - ratio) + color_bottom[0] * ratio)
-        g = int(color_top[1] * (1 - ratio) + color_bottom[1] * ratio)
-        r = int(color_top[2] * (1 - ratio) + color_bottom[2] * ratio)
-        gradient[y, :] = (b, g, r)
-    
+    gradient = out if out is not None else np.zeros((height, width, 3), dtype=np.uint8)
+
+    # Single broadcast instead of a per-row Python loop: interpolate the two
+    # colors down a (height, 3) column and spread it across the width
+    top = np.asarray(color_top, dtype=np.float32)
+    bottom = np.asarray(color_bottom, dtype=np.float32)
+    ratio = np.linspace(0.0, 1.0, height, dtype=np.float32).reshape(-1, 1)
+    rows = (top * (1.0 - ratio) + bottom * ratio).astype(np.uint8)
+    gradient[:] = rows[:, np.newaxis, :]
+
     return gradient
 
 
-def apply_glow(img: np.ndarray, x: int, y: int, w: int, h: int, 
+# Reusable float32 mask buffers for apply_glow, keyed by ROI shape
+_glow_scratch: Dict[Tuple[int, int], np.ndarray] = {}
+
+
+def apply_glow(img: np.ndarray, x: int, y: int, w: int, h: int,
                color: Tuple[int, int, int], intensity: float = 0.5) -> np.ndarray:
     """
-    Apply glow effect around a rectangle.
-    
+    Apply glow effect around a rectangle (in place).
+
+    Works on the glow's bounding region only: the blurred mask and the
+    colored glow stay ROI-sized, and the final blend is one saturating
+    uint8 cv2.add — no full-frame float32 temporaries or clip pass.
+
     Args:
-        img: Input image
+        img: Input image (modified in place)
         x, y: Top-left corner
         w, h: Width and height
         color: Glow color (BGR)
         intensity: Glow intensity (0.0 - 1.0)
-    
+
     Returns:
         Image with glow applied
     """
     import cv2
-    
-    # Create glow mask
+
+    # Fast exit before any allocation: invisible intensity (would quantize
+    # to zero in uint8) or a degenerate rectangle produces no glow
+    if intensity <= 1.0 / 255.0 or w <= 0 or h <= 0:
+        return img
+
     glow_size = 15
-    mask = np.zeros((img.shape[0], img.shape[1]), dtype=np.float32)
-    
-    # Draw filled rectangle on mask
-    cv2.rectangle(mask, (x - glow_size, y - glow_size), 
-                  (x + w + glow_size, y + h + glow_size), 1.0, -1)
-    cv2.rectangle(mask, (x, y), (x + w, y + h), 0.0, -1)
-    
-    # Blur the mask for soft glow
-    mask = cv2.GaussianBlur(mask, (21, 21), 0)
-    
-    # Apply glow color
-    glow_layer = np.zeros_like(img, dtype=np.float32)
-    glow_layer[:, :, 0] = mask * color[0]
-    glow_layer[:, :, 1] = mask * color[1]
-    glow_layer[:, :, 2] = mask * color[2]
-    
-    # Blend with original image
-    result = img.astype(np.float32) + glow_layer * intensity
-    result = np.clip(result, 0, 255).astype(np.uint8)
-    
-    return result
+    blur_pad = 10  # Reach of the box-filter falloff
+    pad = glow_size + blur_pad
+    x1, y1 = max(0, x - pad), max(0, y - pad)
+    x2 = min(img.shape[1], x + w + pad)
+    y2 = min(img.shape[0], y + h + pad)
+    if x2 <= x1 or y2 <= y1:
+        return img
+
+    # Glow mask in ROI coordinates, reusing a per-shape scratch buffer
+    if len(_glow_scratch) > 16:
+        _glow_scratch.clear()
+    mask = _glow_scratch.get((y2 - y1, x2 - x1))
+    if mask is None:
+        mask = np.empty((y2 - y1, x2 - x1), dtype=np.float32)
+        _glow_scratch[(y2 - y1, x2 - x1)] = mask
+    mask.fill(0.0)
+
+    cv2.rectangle(mask, (x - glow_size - x1, y - glow_size - y1),
+                  (x + w + glow_size - x1, y + h + glow_size - y1), 1.0, -1)
+    cv2.rectangle(mask, (x - x1, y - y1), (x + w - x1, y + h - y1), 0.0, -1)
+    # Two box-filter passes approximate the old 21x21 Gaussian falloff but
+    # run in O(1) per pixel regardless of kernel size
+    cv2.boxFilter(mask, -1, (11, 11), dst=mask)
+    cv2.boxFilter(mask, -1, (11, 11), dst=mask)
+
+    # Colored glow as uint8, blended with one saturating add
+    glow = (mask[:, :, np.newaxis] *
+            (np.asarray(color, dtype=np.float32) * np.float32(intensity)))
+    roi = img[y1:y2, x1:x2]
+    cv2.add(roi, glow.astype(np.uint8), dst=roi)
+
+    return img